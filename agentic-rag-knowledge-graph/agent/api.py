@@ -3,40 +3,53 @@ FastAPI endpoints for the agentic RAG system.
 """
 
 import os
+import sys
 import asyncio
-import json
 import logging
 import time
 from contextlib import asynccontextmanager
+from functools import partial
 from typing import Dict, Any, List, Optional
 from datetime import datetime
+import hashlib
+import secrets
 import uuid
 
-from fastapi import FastAPI, HTTPException, Request, Depends
-from fastapi.responses import StreamingResponse
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
+import anyio.to_thread
+from fastapi import FastAPI, HTTPException, Request, Depends, BackgroundTasks
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+import orjson
 import uvicorn
+from cachetools import TTLCache
 from dotenv import load_dotenv
+from pydantic import TypeAdapter
+from pydantic_ai.messages import PartStartEvent, PartDeltaEvent, TextPartDelta, ToolCallPart
+from pydantic_ai.settings import ModelSettings
 
 from .agent import rag_agent, AgentDependencies
+from .embedding_batcher import EmbeddingBatcher
 from .db_utils import (
     initialize_database,
     close_database,
     create_session,
     get_session,
-    add_message,
-    get_session_messages,
+    add_messages_bulk,
+    get_recent_messages,
+    get_documents_version,
     test_connection
 )
 from .graph_utils import initialize_graph, close_graph, test_graph_connection
+from .middleware import ConditionalGZipMiddleware, FastCORSMiddleware
+from .semantic_cache import SemanticCache, normalize_query
 from .models import (
     ChatRequest,
     ChatResponse,
     SearchRequest,
     SearchResponse,
+    SearchType,
+    BatchSearchRequest,
+    BatchSearchResponse,
     StreamDelta,
-    ErrorResponse,
     HealthStatus,
     ToolCall,
     OpenAIChatRequest,
@@ -48,13 +61,15 @@ from .models import (
 )
 from .tools import (
     vector_search_tool,
+    vector_search_batch_tool,
     graph_search_tool,
     hybrid_search_tool,
     list_documents_tool,
     VectorSearchInput,
     GraphSearchInput,
     HybridSearchInput,
-    DocumentListInput
+    DocumentListInput,
+    generate_embeddings
 )
 
 # Load environment variables
@@ -62,34 +77,88 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
-# Application configuration
-APP_ENV = os.getenv("APP_ENV", "development")
-APP_HOST = os.getenv("APP_HOST", "0.0.0.0")
-APP_PORT = int(os.getenv("APP_PORT", 8000))
-LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# Application configuration, re-read in each worker by configure_app()
+APP_ENV = "development"
+MEMORY_ENABLED = True
+STREAMING_ENABLED = True
+SESSION_CACHE_TTL = 60
+SEARCH_CACHE_TTL = 300
+SEARCH_CACHE_THRESHOLD = 0.95
+
+# In-process caches to avoid repeat Postgres round-trips for active sessions,
+# rebuilt with the configured TTL by configure_app()
+_session_cache: TTLCache = TTLCache(maxsize=10_000, ttl=SESSION_CACHE_TTL)
+_context_cache: TTLCache = TTLCache(maxsize=10_000, ttl=SESSION_CACHE_TTL)
+
+# Search results reused for repeat and near-repeat queries. Hybrid ranking
+# also uses full-text rank of the literal query, so it only reuses results
+# for the same normalized text: normalized query -> (limit, results)
+_vector_search_cache = SemanticCache(threshold=SEARCH_CACHE_THRESHOLD, ttl=SEARCH_CACHE_TTL)
+_hybrid_search_cache: TTLCache = TTLCache(maxsize=1024, ttl=SEARCH_CACHE_TTL)
+
+
+def configure_app() -> None:
+    """
+    Read runtime configuration and set up logging for this process.
+    
+    Called from the lifespan handler so that forked workers (e.g. gunicorn
+    with --preload) pick up their own environment instead of inheriting
+    whatever was configured at import time.
+    """
+    global APP_ENV, MEMORY_ENABLED, STREAMING_ENABLED
+    global SESSION_CACHE_TTL, SEARCH_CACHE_TTL, SEARCH_CACHE_THRESHOLD
+    global _session_cache, _context_cache, _hybrid_search_cache
+    
+    APP_ENV = os.getenv("APP_ENV", "development")
+    MEMORY_ENABLED = os.getenv("MEMORY_ENABLED", "true").lower() == "true"
+    STREAMING_ENABLED = os.getenv("STREAMING_ENABLED", "true").lower() == "true"
+    SESSION_CACHE_TTL = int(os.getenv("SESSION_CACHE_TTL", 60))
+    SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", 300))
+    SEARCH_CACHE_THRESHOLD = float(os.getenv("SEARCH_CACHE_THRESHOLD", 0.95))
+    log_level = os.getenv("LOG_LEVEL", "INFO")
+    
+    # LOG_LEVEL alone decides verbosity, including in development
+    logging.basicConfig(
+        level=getattr(logging, log_level.upper()),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    
+    # TTLCache's ttl is fixed at construction, so start with fresh caches
+    _session_cache = TTLCache(maxsize=10_000, ttl=SESSION_CACHE_TTL)
+    _context_cache = TTLCache(maxsize=10_000, ttl=SESSION_CACHE_TTL)
+    _hybrid_search_cache = TTLCache(maxsize=1024, ttl=SEARCH_CACHE_TTL)
+    _vector_search_cache.threshold = SEARCH_CACHE_THRESHOLD
+    _vector_search_cache.ttl = SEARCH_CACHE_TTL
+    _vector_search_cache.clear()
+    
+    # Access logging formats a line per request; skip it in production
+    logging.getLogger("uvicorn.access").disabled = APP_ENV == "production"
+    
+    logger.info(
+        "Agent configured - APP_ENV=%s, MEMORY_ENABLED=%s, STREAMING_ENABLED=%s",
+        APP_ENV, MEMORY_ENABLED, STREAMING_ENABLED
+    )
 
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, LOG_LEVEL.upper()),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
 
-# Set debug level for our module during development
-if APP_ENV == "development":
-    logger.setLevel(logging.DEBUG)
+# Query embeddings from concurrent requests share provider calls
+embedding_batcher = EmbeddingBatcher(generate_embeddings)
 
-# Phase 1 startup verification
-memory_enabled = os.getenv("MEMORY_ENABLED", "true").lower() == "true"
-streaming_enabled = os.getenv("STREAMING_ENABLED", "true").lower() == "true"
-logger.info(f"🚀 Phase 1 Agent Starting - MEMORY_ENABLED={memory_enabled}, STREAMING_ENABLED={streaming_enabled}")
+# Conversation writes still running after their response was sent
+_pending_writes: set = set()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for FastAPI app."""
     # Startup
+    configure_app()
     logger.info("Starting up agentic RAG API...")
     
+    # Sync handlers and run_in_threadpool calls share this limiter (default 40)
+    anyio.to_thread.current_default_thread_limiter().total_tokens = int(
+        os.getenv("THREADPOOL_TOKENS", 200)
+    )
+    
     try:
         # Initialize database connections
         await initialize_database()
@@ -108,6 +177,8 @@ async def lifespan(app: FastAPI):
         if not graph_ok:
             logger.error("Graph database connection failed")
         
+        embedding_batcher.start()
+        
         logger.info("Agentic RAG API startup complete")
         
     except Exception as e:
@@ -120,6 +191,11 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down agentic RAG API...")
     
     try:
+        # Let in-flight conversation writes finish before closing the pool
+        if _pending_writes:
+            await asyncio.gather(*_pending_writes, return_exceptions=True)
+        
+        await embedding_batcher.stop()
         await close_database()
         await close_graph()
         logger.info("Connections closed")
@@ -128,26 +204,122 @@ async def lifespan(app: FastAPI):
 
 
 # Create FastAPI app
+class ORJSONResponse(JSONResponse):
+    """JSON response serialized with orjson."""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
 app = FastAPI(
     title="Agentic RAG with Knowledge Graph",
     description="AI agent combining vector search and knowledge graph for tech company analysis",
     version="0.1.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
-# Add middleware with flexible CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"]
-)
+# Add middleware with flexible CORS (allow all origins, methods and headers)
+app.add_middleware(FastCORSMiddleware)
+
+# Compress large JSON bodies only; SSE streams must flush per token
+app.add_middleware(ConditionalGZipMiddleware, minimum_size=1000)
+
+
+# Server-Sent Events framing
+SSE_PREFIX = b"data: "
+SSE_SUFFIX = b"\n\n"
+SSE_DONE = b"data: [DONE]\n\n"
+
+
+# Placeholder that marks where per-token content is spliced into a frame
+_CONTENT_PLACEHOLDER = "\x00content\x00"
+
 
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+def format_sse(payload: Dict[str, Any]) -> bytes:
+    """Encode a payload as a single SSE data frame."""
+    return SSE_PREFIX + orjson.dumps(payload) + SSE_SUFFIX
+
+
+def build_sse_template(payload: Dict[str, Any]) -> tuple[bytes, bytes]:
+    """
+    Pre-serialize an SSE frame around its content field.
+    
+    Args:
+        payload: Frame payload with _CONTENT_PLACEHOLDER as the content value
+    
+    Returns:
+        Tuple of (prefix, suffix); a frame is prefix + orjson.dumps(content) + suffix
+    """
+    prefix, suffix = format_sse(payload).split(orjson.dumps(_CONTENT_PLACEHOLDER))
+    return prefix, suffix
+
+
+# Token coalescing for streamed responses
+STREAM_COALESCE_WINDOW = 0.01  # Seconds between frames once streaming has started
+STREAM_COALESCE_MAX_CHARS = 256
+
+
+class TokenCoalescer:
+    """
+    Coalesce streamed tokens into fewer SSE frames.
+    
+    The first token is released immediately so time-to-first-token is
+    unchanged; later tokens are held until the window has elapsed or the
+    buffer grows past max_chars.
+    """
+    
+    def __init__(
+        self,
+        window: float = STREAM_COALESCE_WINDOW,
+        max_chars: int = STREAM_COALESCE_MAX_CHARS
+    ):
+        self.window = window
+        self.max_chars = max_chars
+        self._buffer: List[str] = []
+        self._size = 0
+        self._last_flush: Optional[float] = None
+    
+    def add(self, text: str) -> Optional[str]:
+        """Buffer a token, returning the text to send if a frame is due."""
+        self._buffer.append(text)
+        self._size += len(text)
+        
+        now = time.monotonic()
+        if (
+            self._last_flush is None
+            or now - self._last_flush >= self.window
+            or self._size >= self.max_chars
+        ):
+            return self._drain(now)
+        return None
+    
+    def flush(self) -> Optional[str]:
+        """Return any buffered text."""
+        if not self._buffer:
+            return None
+        return self._drain(time.monotonic())
+    
+    def _drain(self, now: float) -> str:
+        text = "".join(self._buffer)
+        self._buffer.clear()
+        self._size = 0
+        self._last_flush = now
+        return text
 
 
 # Helper functions for OpenAI compatibility
+_openai_response_adapter = TypeAdapter(OpenAIChatResponse)
+
+
+def openai_json_response(openai_response: OpenAIChatResponse) -> Response:
+    """Serialize an OpenAI response directly with pydantic-core."""
+    return Response(
+        content=_openai_response_adapter.dump_json(openai_response),
+        media_type="application/json"
+    )
+
+
 def convert_openai_to_internal(openai_request: OpenAIChatRequest) -> tuple[str, Optional[str]]:
     """
     Convert OpenAI chat request to internal format.
@@ -158,17 +330,45 @@ def convert_openai_to_internal(openai_request: OpenAIChatRequest) -> tuple[str,
     Returns:
         Tuple of (user_message, user_id)
     """
-    # Extract the latest user message
-    user_messages = [msg for msg in openai_request.messages if msg.role == "user"]
-    if not user_messages:
+    # Extract the latest user message, scanning back from the end
+    latest_message = None
+    for msg in reversed(openai_request.messages):
+        if msg.role == "user":
+            latest_message = msg.content
+            break
+    if latest_message is None:
         raise HTTPException(status_code=400, detail="No user message found in request")
     
-    latest_message = user_messages[-1].content
     user_id = openai_request.user
     
     return latest_message, user_id
 
 
+# Sampling fields of an OpenAI request that map directly onto model settings
+_FORWARDED_SETTINGS = ("max_tokens", "temperature", "top_p", "frequency_penalty", "presence_penalty")
+
+
+def openai_model_settings(openai_request: OpenAIChatRequest) -> Optional[ModelSettings]:
+    """
+    Extract model settings the client explicitly asked for.
+    
+    Fields left at their request-model defaults are not forwarded, so the
+    agent's own model defaults still apply to them.
+    
+    Args:
+        openai_request: OpenAI chat completion request
+    
+    Returns:
+        Model settings, or None if the client set none
+    """
+    settings = {
+        field: getattr(openai_request, field)
+        for field in _FORWARDED_SETTINGS
+        if field in openai_request.model_fields_set and getattr(openai_request, field) is not None
+    }
+    return ModelSettings(**settings) if settings else None
+
+
 def create_openai_response(content: str, session_id: str, model: str = "gpt-4o-mini", is_stream: bool = False) -> OpenAIChatResponse:
     """
     Create OpenAI-compatible response.
@@ -182,35 +382,34 @@ def create_openai_response(content: str, session_id: str, model: str = "gpt-4o-m
     Returns:
         OpenAI-compatible response
     """
-    import time
-    
-    response_id = f"chatcmpl-{uuid.uuid4().hex[:8]}"
+    # Server-built values are trusted, so skip re-validation with model_construct
+    response_id = f"chatcmpl-{secrets.token_hex(4)}"
     timestamp = int(time.time())
     
     if is_stream:
-        choice = OpenAIChoice(
+        choice = OpenAIChoice.model_construct(
             index=0,
-            delta=OpenAIDelta(content=content),
+            delta=OpenAIDelta.model_construct(content=content),
             finish_reason=None
         )
         object_type = "chat.completion.chunk"
     else:
-        choice = OpenAIChoice(
+        choice = OpenAIChoice.model_construct(
             index=0,
-            message=OpenAIMessage(role="assistant", content=content),
+            message=OpenAIMessage.model_construct(role="assistant", content=content),
             finish_reason="stop"
         )
         object_type = "chat.completion"
     
-    # Estimate token usage (rough approximation)
-    estimated_tokens = len(content.split()) * 1.3
-    usage = OpenAIUsage(
+    # Estimate token usage (rough estimation: ~4 characters per token)
+    estimated_tokens = (len(content) + 3) // 4
+    usage = OpenAIUsage.model_construct(
         prompt_tokens=50,  # Rough estimate
-        completion_tokens=int(estimated_tokens),
-        total_tokens=int(estimated_tokens + 50)
+        completion_tokens=estimated_tokens,
+        total_tokens=estimated_tokens + 50
     ) if not is_stream else None
     
-    return OpenAIChatResponse(
+    return OpenAIChatResponse.model_construct(
         id=response_id,
         object=object_type,
         created=timestamp,
@@ -221,32 +420,103 @@ def create_openai_response(content: str, session_id: str, model: str = "gpt-4o-m
 
 
 # Helper functions for agent execution
+async def get_cached_session(session_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get session by ID, serving recent lookups from the in-process cache.
+    
+    Args:
+        session_id: Session ID
+    
+    Returns:
+        Session data or None if not found/expired
+    """
+    session = _session_cache.get(session_id)
+    if session is None:
+        session = await get_session(session_id)
+        if session:
+            _session_cache[session_id] = session
+    return session
+
+
+def _render_context(context: List[Dict[str, str]]) -> str:
+    """Render conversation context for the prompt."""
+    return "\n".join([
+        f"{msg['role']}: {msg['content']}"
+        for msg in context
+    ])
+
+
+def update_conversation_context(
+    session_id: str,
+    messages: List[Dict[str, Any]],
+    snapshot: Optional[tuple]
+) -> None:
+    """
+    Append newly stored messages to the cached conversation context.
+    
+    Args:
+        session_id: Session ID
+        messages: Messages that were just written to the database
+        snapshot: Cache entry observed before the write
+    """
+    # Anything cached during the write may already include these messages
+    if snapshot is None or _context_cache.get(session_id) is not snapshot:
+        _context_cache.pop(session_id, None)
+        return
+    
+    max_messages, context, _ = snapshot
+    context = (context + [
+        {"role": msg["role"], "content": msg["content"]}
+        for msg in messages
+    ])[-max_messages:]
+    _context_cache[session_id] = (max_messages, context, _render_context(context))
+
+
+def build_prompt(message: str, context_str: str) -> str:
+    """Build the agent prompt from the user message and rendered context."""
+    if not context_str:
+        return message
+    return f"Previous conversation:\n{context_str}\n\nCurrent question: {message}"
+
+
 async def get_or_create_session(request: ChatRequest) -> str:
     """Get existing session or create new one."""
-    logger.info(f"get_or_create_session called with session_id: {request.session_id}, user_id: {request.user_id}")
+    logger.debug("get_or_create_session called with session_id: %s, user_id: %s", request.session_id, request.user_id)
     
     if request.session_id:
-        logger.info(f"Checking existing session: {request.session_id}")
-        session = await get_session(request.session_id)
+        logger.debug("Checking existing session: %s", request.session_id)
+        session = await get_cached_session(request.session_id)
         if session:
-            logger.info(f"Found existing session: {request.session_id}")
+            logger.debug("Found existing session: %s", request.session_id)
             return request.session_id
         else:
-            logger.info(f"Session {request.session_id} not found, creating new one")
+            logger.debug("Session %s not found, creating new one", request.session_id)
     
     # Create new session
-    logger.info(f"Creating new session for user_id: {request.user_id}")
+    logger.debug("Creating new session for user_id: %s", request.user_id)
     new_session_id = await create_session(
         user_id=request.user_id,
         metadata=request.metadata
     )
-    logger.info(f"Created new session: {new_session_id}")
+    logger.debug("Created new session: %s", new_session_id)
     return new_session_id
 
 
+async def _get_context_entry(session_id: str, max_messages: int) -> tuple:
+    """Get the cached (max_messages, context, context_str) entry, loading on miss."""
+    cached = _context_cache.get(session_id)
+    if cached is not None and cached[0] == max_messages:
+        return cached
+    
+    context = await get_recent_messages(session_id, limit=max_messages)
+    entry = (max_messages, context, _render_context(context))
+    _context_cache[session_id] = entry
+    return entry
+
+
 async def get_conversation_context(
     session_id: str,
-    max_messages: int = 10
+    max_messages: int = 6  # Last 3 turns
 ) -> List[Dict[str, str]]:
     """
     Get recent conversation context.
@@ -258,15 +528,26 @@ async def get_conversation_context(
     Returns:
         List of messages
     """
-    messages = await get_session_messages(session_id, limit=max_messages)
+    entry = await _get_context_entry(session_id, max_messages)
+    return entry[1]
+
+
+async def get_conversation_context_str(
+    session_id: str,
+    max_messages: int = 6  # Last 3 turns
+) -> str:
+    """
+    Get recent conversation context rendered for the prompt.
     
-    return [
-        {
-            "role": msg["role"],
-            "content": msg["content"]
-        }
-        for msg in messages
-    ]
+    Args:
+        session_id: Session ID
+        max_messages: Maximum number of messages to retrieve
+    
+    Returns:
+        Rendered context, empty if the session has no messages
+    """
+    entry = await _get_context_entry(session_id, max_messages)
+    return entry[2]
 
 
 def extract_tool_calls(result) -> List[ToolCall]:
@@ -280,70 +561,82 @@ def extract_tool_calls(result) -> List[ToolCall]:
         List of ToolCall objects
     """
     tools_used = []
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
     
     try:
         # Get all messages from the result
         messages = result.all_messages()
         
         for message in messages:
-            if hasattr(message, 'parts'):
-                for part in message.parts:
-                    # Check if this is a tool call part
-                    if part.__class__.__name__ == 'ToolCallPart':
+            for part in getattr(message, 'parts', ()):
+                # Check if this is a tool call part
+                if not isinstance(part, ToolCallPart):
+                    continue
+                
+                try:
+                    tool_name = str(getattr(part, 'tool_name', 'unknown'))
+                    
+                    # Args may already be a dict, or a JSON string to decode
+                    tool_args = getattr(part, 'args', None)
+                    if not isinstance(tool_args, dict):
                         try:
-                            # Debug logging to understand structure
-                            logger.debug(f"ToolCallPart attributes: {dir(part)}")
-                            logger.debug(f"ToolCallPart content: tool_name={getattr(part, 'tool_name', None)}")
-                            
-                            # Extract tool information safely
-                            tool_name = str(part.tool_name) if hasattr(part, 'tool_name') else 'unknown'
-                            
-                            # Get args - the args field is a JSON string in Pydantic AI
-                            tool_args = {}
-                            if hasattr(part, 'args') and part.args is not None:
-                                if isinstance(part.args, str):
-                                    # Args is a JSON string, parse it
-                                    try:
-                                        import json
-                                        tool_args = json.loads(part.args)
-                                        logger.debug(f"Parsed args from JSON string: {tool_args}")
-                                    except json.JSONDecodeError as e:
-                                        logger.debug(f"Failed to parse args JSON: {e}")
-                                        tool_args = {}
-                                elif isinstance(part.args, dict):
-                                    tool_args = part.args
-                                    logger.debug(f"Args already a dict: {tool_args}")
-                            
-                            # Alternative: use args_as_dict method if available
-                            if hasattr(part, 'args_as_dict'):
-                                try:
-                                    tool_args = part.args_as_dict()
-                                    logger.debug(f"Got args from args_as_dict(): {tool_args}")
-                                except:
-                                    pass
-                            
-                            # Get tool call ID
-                            tool_call_id = None
-                            if hasattr(part, 'tool_call_id'):
-                                tool_call_id = str(part.tool_call_id) if part.tool_call_id else None
-                            
-                            # Create ToolCall with explicit field mapping
-                            tool_call_data = {
-                                "tool_name": tool_name,
-                                "args": tool_args,
-                                "tool_call_id": tool_call_id
-                            }
-                            logger.debug(f"Creating ToolCall with data: {tool_call_data}")
-                            tools_used.append(ToolCall(**tool_call_data))
+                            tool_args = part.args_as_dict()
                         except Exception as e:
-                            logger.debug(f"Failed to parse tool call part: {e}")
-                            continue
+                            if debug_enabled:
+                                logger.debug("Failed to parse args JSON: %s", e)
+                            tool_args = {}
+                    
+                    tool_call_id = getattr(part, 'tool_call_id', None)
+                    tool_call = ToolCall(
+                        tool_name=tool_name,
+                        args=tool_args,
+                        tool_call_id=str(tool_call_id) if tool_call_id else None
+                    )
+                    if debug_enabled:
+                        logger.debug("Extracted tool call: %s", tool_call)
+                    tools_used.append(tool_call)
+                except Exception as e:
+                    if debug_enabled:
+                        logger.debug("Failed to parse tool call part: %s", e)
+                    continue
     except Exception as e:
         logger.warning(f"Failed to extract tool calls: {e}")
     
     return tools_used
 
 
+def _on_write_done(task: asyncio.Task) -> None:
+    """Release a finished background write and log any failure."""
+    _pending_writes.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Background conversation write failed: {task.exception()}")
+
+
+def schedule_write(coro) -> None:
+    """
+    Run a database write without holding up the response.
+    
+    Args:
+        coro: Write coroutine to run in the background
+    """
+    task = asyncio.create_task(coro)
+    _pending_writes.add(task)
+    task.add_done_callback(_on_write_done)
+
+
+async def persist_messages(session_id: str, messages: List[Dict[str, Any]]):
+    """
+    Store messages and roll them into the cached conversation context.
+    
+    Args:
+        session_id: Session ID
+        messages: Message dicts with role, content and optional metadata
+    """
+    snapshot = _context_cache.get(session_id)
+    await add_messages_bulk(session_id=session_id, messages=messages)
+    update_conversation_context(session_id, messages, snapshot)
+
+
 async def save_conversation_turn(
     session_id: str,
     user_message: str,
@@ -359,29 +652,32 @@ async def save_conversation_turn(
         assistant_message: Assistant's response
         metadata: Optional metadata
     """
-    # Save user message
-    logger.info(f"Saving user message for session_id: {session_id}")
-    await add_message(
-        session_id=session_id,
-        role="user",
-        content=user_message,
-        metadata=metadata or {}
-    )
-    
-    # Save assistant message
-    await add_message(
-        session_id=session_id,
-        role="assistant",
-        content=assistant_message,
-        metadata=metadata or {}
+    # Save user and assistant messages in one round-trip
+    logger.debug("Saving conversation turn for session_id: %s", session_id)
+    await persist_messages(
+        session_id,
+        [
+            {"role": "user", "content": user_message, "metadata": metadata or {}},
+            {"role": "assistant", "content": assistant_message, "metadata": metadata or {}}
+        ]
     )
 
 
+async def _save_or_defer(background_tasks: Optional[BackgroundTasks], **turn):
+    """Save a conversation turn now, or after the response if background tasks are available."""
+    if background_tasks is not None:
+        background_tasks.add_task(save_conversation_turn, **turn)
+    else:
+        await save_conversation_turn(**turn)
+
+
 async def execute_agent(
     message: str,
     session_id: str,
     user_id: Optional[str] = None,
-    save_conversation: bool = True
+    save_conversation: bool = True,
+    background_tasks: Optional[BackgroundTasks] = None,
+    model_settings: Optional[ModelSettings] = None
 ) -> tuple[str, List[ToolCall]]:
     """
     Execute the agent with a message.
@@ -391,6 +687,8 @@ async def execute_agent(
         session_id: Session ID
         user_id: Optional user ID
         save_conversation: Whether to save the conversation
+        background_tasks: If given, the conversation is saved after the response is sent
+        model_settings: Optional model settings (e.g. max_tokens) for this run
     
     Returns:
         Tuple of (agent response, tools used)
@@ -402,27 +700,20 @@ async def execute_agent(
             user_id=user_id
         )
         
-        # Get conversation context
-        context = await get_conversation_context(session_id)
-        
         # Build prompt with context
-        full_prompt = message
-        if context:
-            context_str = "\n".join([
-                f"{msg['role']}: {msg['content']}"
-                for msg in context[-6:]  # Last 3 turns
-            ])
-            full_prompt = f"Previous conversation:\n{context_str}\n\nCurrent question: {message}"
+        context_str = await get_conversation_context_str(session_id)
+        full_prompt = build_prompt(message, context_str)
         
         # Run the agent
-        result = await rag_agent.run(full_prompt, deps=deps)
+        result = await rag_agent.run(full_prompt, deps=deps, model_settings=model_settings)
         
         response = result.data
         tools_used = extract_tool_calls(result)
         
         # Save conversation if requested
         if save_conversation:
-            await save_conversation_turn(
+            await _save_or_defer(
+                background_tasks,
                 session_id=session_id,
                 user_message=message,
                 assistant_message=response,
@@ -439,7 +730,8 @@ async def execute_agent(
         error_response = f"I encountered an error while processing your request: {str(e)}"
         
         if save_conversation:
-            await save_conversation_turn(
+            await _save_or_defer(
+                background_tasks,
                 session_id=session_id,
                 user_message=message,
                 assistant_message=error_response,
@@ -455,14 +747,15 @@ async def _create_streaming_response(
     user_id: Optional[str],
     model: str,
     save_conversation: bool,
-    memory_enabled: bool
+    memory_enabled: bool,
+    model_settings: Optional[ModelSettings] = None
 ):
     """Create OpenAI-compatible streaming response."""
     async def generate_openai_stream():
         """Generate OpenAI-compatible SSE stream."""
         try:
             # Create response ID for OpenAI format
-            response_id = f"chatcmpl-{uuid.uuid4().hex[:8]}"
+            response_id = f"chatcmpl-{secrets.token_hex(4)}"
             timestamp = int(time.time())
             
             # Create dependencies
@@ -472,30 +765,36 @@ async def _create_streaming_response(
             )
             
             # Get conversation context if memory enabled
-            context = []
+            context_str = ""
             if memory_enabled:
-                context = await get_conversation_context(session_id)
+                context_str = await get_conversation_context_str(session_id)
             
             # Build prompt with context
-            full_prompt = user_message
-            if context:
-                context_str = "\n".join([
-                    f"{msg['role']}: {msg['content']}"
-                    for msg in context[-6:]  # Last 3 turns
-                ])
-                full_prompt = f"Previous conversation:\n{context_str}\n\nCurrent question: {user_message}"
+            full_prompt = build_prompt(user_message, context_str)
             
             full_response = ""
             
+            # Only the delta content is encoded per token
+            chunk_prefix, chunk_suffix = build_sse_template({
+                "id": response_id,
+                "object": "chat.completion.chunk",
+                "created": timestamp,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "delta": {"content": _CONTENT_PLACEHOLDER},
+                    "finish_reason": None
+                }]
+            })
+            coalescer = TokenCoalescer()
+            
             # Stream using agent.iter() pattern (same as /chat/stream)
-            async with rag_agent.iter(full_prompt, deps=deps) as run:
+            async with rag_agent.iter(full_prompt, deps=deps, model_settings=model_settings) as run:
                 async for node in run:
                     if rag_agent.is_model_request_node(node):
                         # Stream tokens from the model
                         async with node.stream(run.ctx) as request_stream:
                             async for event in request_stream:
-                                from pydantic_ai.messages import PartStartEvent, PartDeltaEvent, TextPartDelta
-                                
                                 delta_content = ""
                                 if isinstance(event, PartStartEvent) and event.part.part_kind == 'text':
                                     delta_content = event.part.content
@@ -506,19 +805,14 @@ async def _create_streaming_response(
                                     full_response += delta_content
                                     
                                     # Create OpenAI-compatible chunk
-                                    chunk = {
-                                        "id": response_id,
-                                        "object": "chat.completion.chunk",
-                                        "created": timestamp,
-                                        "model": model,
-                                        "choices": [{
-                                            "index": 0,
-                                            "delta": {"content": delta_content},
-                                            "finish_reason": None
-                                        }]
-                                    }
-                                    
-                                    yield f"data: {json.dumps(chunk)}\n\n"
+                                    pending = coalescer.add(delta_content)
+                                    if pending:
+                                        yield chunk_prefix + orjson.dumps(pending) + chunk_suffix
+                        
+                        # Don't hold text back across tool calls
+                        pending = coalescer.flush()
+                        if pending:
+                            yield chunk_prefix + orjson.dumps(pending) + chunk_suffix
             
             # Send final chunk with finish_reason
             final_chunk = {
@@ -532,14 +826,14 @@ async def _create_streaming_response(
                     "finish_reason": "stop"
                 }]
             }
-            yield f"data: {json.dumps(final_chunk)}\n\n"
+            yield format_sse(final_chunk)
             
             # Send [DONE] message per OpenAI spec
-            yield "data: [DONE]\n\n"
+            yield SSE_DONE
             
-            # Save conversation if enabled
+            # Save conversation if enabled, without holding the stream open
             if save_conversation:
-                await save_conversation_turn(
+                schedule_write(save_conversation_turn(
                     session_id=session_id,
                     user_message=user_message,
                     assistant_message=full_response,
@@ -548,13 +842,13 @@ async def _create_streaming_response(
                         "streamed": True,
                         "openai_format": True
                     }
-                )
+                ))
             
         except Exception as e:
             logger.error(f"Streaming error: {e}")
             # Send error chunk
             error_chunk = {
-                "id": f"chatcmpl-{uuid.uuid4().hex[:8]}",
+                "id": f"chatcmpl-{secrets.token_hex(4)}",
                 "object": "chat.completion.chunk",
                 "created": int(time.time()),
                 "model": model,
@@ -564,8 +858,8 @@ async def _create_streaming_response(
                     "finish_reason": "stop"
                 }]
             }
-            yield f"data: {json.dumps(error_chunk)}\n\n"
-            yield "data: [DONE]\n\n"
+            yield format_sse(error_chunk)
+            yield SSE_DONE
     
     return StreamingResponse(
         generate_openai_stream(),
@@ -579,35 +873,38 @@ async def _create_streaming_response(
 
 
 # OpenAI-compatible API Endpoints
+# The model list never changes, so its body is serialized once at import
+_MODELS_BODY = orjson.dumps({
+    "object": "list",
+    "data": [
+        {
+            "id": "gpt-4o-mini",
+            "object": "model", 
+            "created": 1640995200,  # Static timestamp
+            "owned_by": "local-ai-packaged",
+            "permission": [],
+            "root": "gpt-4o-mini",
+            "parent": None
+        }
+    ]
+})
+
+
 @app.get("/v1/models")
 async def get_models():
     """OpenAI-compatible models endpoint."""
-    return {
-        "object": "list",
-        "data": [
-            {
-                "id": "gpt-4o-mini",
-                "object": "model", 
-                "created": 1640995200,  # Static timestamp
-                "owned_by": "local-ai-packaged",
-                "permission": [],
-                "root": "gpt-4o-mini",
-                "parent": None
-            }
-        ]
-    }
+    return Response(content=_MODELS_BODY, media_type="application/json")
 
 
 @app.post("/v1/chat/completions")
-async def chat_completions(request: OpenAIChatRequest):
+async def chat_completions(request: OpenAIChatRequest, background_tasks: BackgroundTasks):
     """OpenAI-compatible chat completions endpoint."""
     # Phase 1 startup log to verify container is running updated code
-    logger.info("🤖 OpenAI Chat Completions - Streaming:" + str(request.stream))
+    logger.debug("🤖 OpenAI Chat Completions - Streaming: %s", request.stream)
     
     try:
         # Check if streaming is requested but disabled
-        streaming_enabled = os.getenv("STREAMING_ENABLED", "true").lower() == "true"
-        if request.stream and not streaming_enabled:
+        if request.stream and not STREAMING_ENABLED:
             raise HTTPException(
                 status_code=400, 
                 detail="Streaming is disabled in this configuration"
@@ -615,9 +912,10 @@ async def chat_completions(request: OpenAIChatRequest):
         
         # Convert OpenAI format to internal format
         user_message, user_id = convert_openai_to_internal(request)
+        model_settings = openai_model_settings(request)
         
         # Check memory mode
-        memory_enabled = os.getenv("MEMORY_ENABLED", "true").lower() == "true"
+        memory_enabled = MEMORY_ENABLED
         
         if memory_enabled:
             # Full memory mode - use existing session logic
@@ -643,7 +941,8 @@ async def chat_completions(request: OpenAIChatRequest):
                 user_id=user_id,
                 model=request.model,
                 save_conversation=save_conversation,
-                memory_enabled=memory_enabled
+                memory_enabled=memory_enabled,
+                model_settings=model_settings
             )
         else:
             # Non-streaming response
@@ -651,7 +950,9 @@ async def chat_completions(request: OpenAIChatRequest):
                 message=user_message,
                 session_id=session_id,
                 user_id=user_id,
-                save_conversation=save_conversation
+                save_conversation=save_conversation,
+                background_tasks=background_tasks,
+                model_settings=model_settings
             )
             
             # Create OpenAI-compatible response
@@ -662,7 +963,7 @@ async def chat_completions(request: OpenAIChatRequest):
                 is_stream=False
             )
             
-            return openai_response
+            return openai_json_response(openai_response)
         
     except Exception as e:
         logger.error(f"Chat completions endpoint failed: {e}")
@@ -670,12 +971,12 @@ async def chat_completions(request: OpenAIChatRequest):
         # Handle OpenAI quota errors gracefully
         error_message = str(e)
         if "insufficient_quota" in error_message or "429" in error_message:
-            return create_openai_response(
+            return openai_json_response(create_openai_response(
                 content="I'm currently experiencing high demand and cannot process your request. Please try again in a few minutes, or contact the administrator about API quota limits.",
                 session_id=session_id if 'session_id' in locals() else "error-session",
                 model=request.model,
                 is_stream=False
-            )
+            ))
         
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -712,7 +1013,7 @@ async def health_check():
 
 
 @app.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, background_tasks: BackgroundTasks):
     """Non-streaming chat endpoint."""
     try:
         # Get or create session
@@ -722,7 +1023,8 @@ async def chat(request: ChatRequest):
         response, tools_used = await execute_agent(
             message=request.message,
             session_id=session_id,
-            user_id=request.user_id
+            user_id=request.user_id,
+            background_tasks=background_tasks
         )
         
         return ChatResponse(
@@ -746,8 +1048,18 @@ async def chat_stream(request: ChatRequest):
         
         async def generate_stream():
             """Generate streaming response using agent.iter() pattern."""
+            # User message is persisted with the assistant reply at end of stream
+            user_row = {
+                "role": "user",
+                "content": request.message,
+                "metadata": {"user_id": request.user_id}
+            }
+            
+            # Fetch conversation context while the session frame is flushed
+            context_task = asyncio.create_task(get_conversation_context_str(session_id))
+            
             try:
-                yield f"data: {json.dumps({'type': 'session', 'session_id': session_id})}\n\n"
+                yield format_sse({'type': 'session', 'session_id': session_id})
                 
                 # Create dependencies
                 deps = AgentDependencies(
@@ -755,28 +1067,17 @@ async def chat_stream(request: ChatRequest):
                     user_id=request.user_id
                 )
                 
-                # Get conversation context
-                context = await get_conversation_context(session_id)
-                
                 # Build input with context
-                full_prompt = request.message
-                if context:
-                    context_str = "\n".join([
-                        f"{msg['role']}: {msg['content']}"
-                        for msg in context[-6:]
-                    ])
-                    full_prompt = f"Previous conversation:\n{context_str}\n\nCurrent question: {request.message}"
-                
-                # Save user message immediately
-                await add_message(
-                    session_id=session_id,
-                    role="user",
-                    content=request.message,
-                    metadata={"user_id": request.user_id}
-                )
+                full_prompt = build_prompt(request.message, await context_task)
                 
                 full_response = ""
                 
+                # Only the delta content is encoded per token
+                text_prefix, text_suffix = build_sse_template(
+                    {'type': 'text', 'content': _CONTENT_PLACEHOLDER}
+                )
+                coalescer = TokenCoalescer()
+                
                 # Stream using agent.iter() pattern
                 async with rag_agent.iter(full_prompt, deps=deps) as run:
                     async for node in run:
@@ -784,17 +1085,22 @@ async def chat_stream(request: ChatRequest):
                             # Stream tokens from the model
                             async with node.stream(run.ctx) as request_stream:
                                 async for event in request_stream:
-                                    from pydantic_ai.messages import PartStartEvent, PartDeltaEvent, TextPartDelta
-                                    
+                                    delta_content = ""
                                     if isinstance(event, PartStartEvent) and event.part.part_kind == 'text':
                                         delta_content = event.part.content
-                                        yield f"data: {json.dumps({'type': 'text', 'content': delta_content})}\n\n"
-                                        full_response += delta_content
-                                        
                                     elif isinstance(event, PartDeltaEvent) and isinstance(event.delta, TextPartDelta):
                                         delta_content = event.delta.content_delta
-                                        yield f"data: {json.dumps({'type': 'text', 'content': delta_content})}\n\n"
+                                    
+                                    if delta_content:
                                         full_response += delta_content
+                                        pending = coalescer.add(delta_content)
+                                        if pending:
+                                            yield text_prefix + orjson.dumps(pending) + text_suffix
+                            
+                            # Don't hold text back across tool calls
+                            pending = coalescer.flush()
+                            if pending:
+                                yield text_prefix + orjson.dumps(pending) + text_suffix
                 
                 # Extract tools used from the final result
                 result = run.result
@@ -810,20 +1116,24 @@ async def chat_stream(request: ChatRequest):
                         }
                         for tool in tools_used
                     ]
-                    yield f"data: {json.dumps({'type': 'tools', 'tools': tools_data})}\n\n"
+                    yield format_sse({'type': 'tools', 'tools': tools_data})
                 
-                # Save assistant response
-                await add_message(
-                    session_id=session_id,
-                    role="assistant",
-                    content=full_response,
-                    metadata={
-                        "streamed": True,
-                        "tool_calls": len(tools_used)
+                # Save user message and assistant response together
+                messages = [
+                    user_row,
+                    {
+                        "role": "assistant",
+                        "content": full_response,
+                        "metadata": {
+                            "streamed": True,
+                            "tool_calls": len(tools_used)
+                        }
                     }
-                )
+                ]
+                schedule_write(persist_messages(session_id, messages))
+                user_row = None
                 
-                yield f"data: {json.dumps({'type': 'end'})}\n\n"
+                yield format_sse({'type': 'end'})
                 
             except Exception as e:
                 logger.error(f"Stream error: {e}")
@@ -831,7 +1141,15 @@ async def chat_stream(request: ChatRequest):
                     "type": "error",
                     "content": f"Stream error: {str(e)}"
                 }
-                yield f"data: {json.dumps(error_chunk)}\n\n"
+                yield format_sse(error_chunk)
+            
+            finally:
+                # No-op once awaited; stops the fetch if the client disconnected early
+                context_task.cancel()
+                
+                # Keep the user turn if the run failed or the client went away
+                if user_row is not None:
+                    schedule_write(persist_messages(session_id, [user_row]))
         
         return StreamingResponse(
             generate_stream(),
@@ -848,53 +1166,158 @@ async def chat_stream(request: ChatRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Search endpoints build responses from already-validated tool results
+_vector_response = partial(SearchResponse.model_construct, search_type=SearchType.VECTOR)
+_graph_response = partial(SearchResponse.model_construct, search_type=SearchType.GRAPH)
+_hybrid_response = partial(SearchResponse.model_construct, search_type=SearchType.HYBRID)
+_search_response_adapter = TypeAdapter(SearchResponse)
+_batch_search_response_adapter = TypeAdapter(BatchSearchResponse)
+
+
+def search_json_response(search_response: SearchResponse) -> Response:
+    """Serialize a search response directly with pydantic-core."""
+    return Response(
+        content=_search_response_adapter.dump_json(search_response),
+        media_type="application/json"
+    )
+
+
+async def _embed_query(query: str) -> Optional[List[float]]:
+    """Embed a search query, or return None if the provider fails."""
+    try:
+        return await embedding_batcher.embed(query)
+    except Exception as e:
+        # Search tools report provider errors as empty results, not 500s
+        logger.error(f"Query embedding failed: {e}")
+        return None
+
+
+async def cached_search(cache: SemanticCache, search_tool, input_data) -> List[Any]:
+    """
+    Run an embedding-based search through the semantic cache.
+    
+    Repeated query texts are answered before embedding; otherwise the query
+    is embedded and matched against cached embeddings before searching.
+    
+    Args:
+        cache: Semantic cache for this search type
+        search_tool: Search tool accepting a precomputed embedding
+        input_data: Tool input with query and limit
+    
+    Returns:
+        Search results
+    """
+    results = cache.get_text(input_data.query, input_data.limit)
+    if results is not None:
+        return results
+    
+    embedding = await _embed_query(input_data.query)
+    if embedding is None:
+        return []
+    
+    results = cache.get(embedding, input_data.limit, text=input_data.query)
+    if results is None:
+        results = await search_tool(input_data, embedding=embedding)
+        if results:
+            cache.set(embedding, input_data.limit, results, text=input_data.query)
+    return results
+
+
+async def cached_text_search(cache: TTLCache, search_tool, input_data) -> List[Any]:
+    """
+    Run an embedding-based search, reusing results only for the same query text.
+    
+    Args:
+        cache: Normalized query -> (limit, results) cache
+        search_tool: Search tool accepting a precomputed embedding
+        input_data: Tool input with query and limit
+    
+    Returns:
+        Search results
+    """
+    key = normalize_query(input_data.query)
+    cached = cache.get(key)
+    # Results are ranked, so a larger cached limit covers smaller ones
+    if cached is not None and input_data.limit <= cached[0]:
+        return cached[1][:input_data.limit]
+    
+    embedding = await _embed_query(input_data.query)
+    if embedding is None:
+        return []
+    
+    results = await search_tool(input_data, embedding=embedding)
+    if results and cache.ttl > 0:
+        cache[key] = (input_data.limit, results)
+    return results
+
+
 @app.post("/search/vector")
 async def search_vector(request: SearchRequest):
     """Vector search endpoint."""
     try:
-        input_data = VectorSearchInput(
+        # SearchRequest is already validated
+        input_data = VectorSearchInput.model_construct(
             query=request.query,
             limit=request.limit
         )
         
-        start_time = datetime.now()
-        results = await vector_search_tool(input_data)
-        end_time = datetime.now()
-        
-        query_time = (end_time - start_time).total_seconds() * 1000
+        start_time = time.perf_counter_ns()
+        results = await cached_search(_vector_search_cache, vector_search_tool, input_data)
+        query_time = (time.perf_counter_ns() - start_time) / 1_000_000
         
-        return SearchResponse(
+        search_response = _vector_response(
             results=results,
             total_results=len(results),
-            search_type="vector",
             query_time_ms=query_time
         )
+        return search_json_response(search_response)
         
     except Exception as e:
         logger.error(f"Vector search failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/search/vector:batch")
+async def search_vector_batch(request: BatchSearchRequest):
+    """Batch vector search endpoint."""
+    try:
+        start_time = time.perf_counter_ns()
+        results = await vector_search_batch_tool(request.queries, limit=request.limit)
+        query_time = (time.perf_counter_ns() - start_time) / 1_000_000
+        
+        batch_response = BatchSearchResponse.model_construct(
+            results=results,
+            total_results=sum(len(query_results) for query_results in results),
+            query_time_ms=query_time
+        )
+        return Response(
+            content=_batch_search_response_adapter.dump_json(batch_response),
+            media_type="application/json"
+        )
+        
+    except Exception as e:
+        logger.error(f"Batch vector search failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.post("/search/graph")
 async def search_graph(request: SearchRequest):
     """Knowledge graph search endpoint."""
     try:
-        input_data = GraphSearchInput(
+        input_data = GraphSearchInput.model_construct(
             query=request.query
         )
         
-        start_time = datetime.now()
+        start_time = time.perf_counter_ns()
         results = await graph_search_tool(input_data)
-        end_time = datetime.now()
-        
-        query_time = (end_time - start_time).total_seconds() * 1000
+        query_time = (time.perf_counter_ns() - start_time) / 1_000_000
         
-        return SearchResponse(
+        search_response = _graph_response(
             graph_results=results,
             total_results=len(results),
-            search_type="graph",
             query_time_ms=query_time
         )
+        return search_json_response(search_response)
         
     except Exception as e:
         logger.error(f"Graph search failed: {e}")
@@ -905,45 +1328,56 @@ async def search_graph(request: SearchRequest):
 async def search_hybrid(request: SearchRequest):
     """Hybrid search endpoint."""
     try:
-        input_data = HybridSearchInput(
+        input_data = HybridSearchInput.model_construct(
             query=request.query,
             limit=request.limit
         )
         
-        start_time = datetime.now()
-        results = await hybrid_search_tool(input_data)
-        end_time = datetime.now()
+        start_time = time.perf_counter_ns()
+        results = await cached_text_search(_hybrid_search_cache, hybrid_search_tool, input_data)
+        query_time = (time.perf_counter_ns() - start_time) / 1_000_000
         
-        query_time = (end_time - start_time).total_seconds() * 1000
-        
-        return SearchResponse(
+        search_response = _hybrid_response(
             results=results,
             total_results=len(results),
-            search_type="hybrid",
             query_time_ms=query_time
         )
+        return search_json_response(search_response)
         
     except Exception as e:
         logger.error(f"Hybrid search failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def documents_etag(version: str, limit: int, offset: int) -> str:
+    """Build the ETag for one page of the document listing."""
+    digest = hashlib.blake2b(f"{version}:{limit}:{offset}".encode(), digest_size=8)
+    return f'"{digest.hexdigest()}"'
+
+
 @app.get("/documents")
 async def list_documents_endpoint(
+    request: Request,
     limit: int = 20,
     offset: int = 0
 ):
     """List documents endpoint."""
     try:
-        input_data = DocumentListInput(limit=limit, offset=offset)
+        # Let polling clients skip the listing query and body when unchanged
+        etag = documents_etag(await get_documents_version(), limit, offset)
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        
+        input_data = DocumentListInput.model_construct(limit=limit, offset=offset)
         documents = await list_documents_tool(input_data)
         
-        return {
-            "documents": documents,
+        # Dump models directly rather than through jsonable_encoder
+        return ORJSONResponse({
+            "documents": [document.model_dump(mode="json") for document in documents],
             "total": len(documents),
             "limit": limit,
             "offset": offset
-        }
+        }, headers={"ETag": etag})
         
     except Exception as e:
         logger.error(f"Document listing failed: {e}")
@@ -971,21 +1405,35 @@ async def get_session_info(session_id: str):
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler."""
-    logger.error(f"Unhandled exception: {exc}")
+    logger.exception("Unhandled exception: %s", exc)
     
-    return ErrorResponse(
-        error=str(exc),
-        error_type=type(exc).__name__,
-        request_id=str(uuid.uuid4())
+    # Same shape as ErrorResponse, built without model validation
+    return ORJSONResponse(
+        {
+            "error": str(exc),
+            "error_type": type(exc).__name__,
+            "details": None,
+            "request_id": uuid.uuid4().hex
+        },
+        status_code=500
     )
 
 
 # Development server
 if __name__ == "__main__":
+    app_env = os.getenv("APP_ENV", "development")
+    log_level = os.getenv("LOG_LEVEL", "INFO")
+    reload = app_env == "development"
     uvicorn.run(
         "agent.api:app",
-        host=APP_HOST,
-        port=APP_PORT,
-        reload=APP_ENV == "development",
-        log_level=LOG_LEVEL.lower()
-    )
\ No newline at end of file
+        host=os.getenv("APP_HOST", "0.0.0.0"),
+        port=int(os.getenv("APP_PORT", 8000)),
+        reload=reload,
+        # Worker processes cannot be combined with auto-reload
+        workers=None if reload else int(os.getenv("WEB_CONCURRENCY", 1)),
+        # uvloop is not available on Windows (see the dependency marker)
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        log_level=log_level.lower(),
+        access_log=app_env != "production"
+    )
@@ -216,6 +216,57 @@ async def add_message(
         return result["id"]
 
 
+async def add_messages_bulk(
+    session_id: str,
+    messages: List[Dict[str, Any]]
+) -> List[str]:
+    """
+    Add several messages to a session in a single round-trip.
+
+    Args:
+        session_id: Session UUID
+        messages: Message dicts with role, content and optional metadata
+
+    Returns:
+        Message IDs in insertion order
+    """
+    if not messages:
+        return []
+
+    roles = []
+    contents = []
+    metadata = []
+    for message in messages:
+        roles.append(message["role"])
+        contents.append(message["content"])
+        metadata.append(json.dumps(message.get("metadata") or {}))
+
+    async with db_pool.acquire() as conn:
+        # Fixed SQL text regardless of batch size; rows are offset by a
+        # microsecond each so created_at preserves the turn order
+        results = await conn.fetch(
+            """
+            INSERT INTO messages (session_id, role, content, metadata, created_at)
+            SELECT
+                $1::uuid,
+                m.role,
+                m.content,
+                m.metadata::jsonb,
+                CURRENT_TIMESTAMP + m.ord * INTERVAL '1 microsecond'
+            FROM unnest($2::text[], $3::text[], $4::text[])
+                WITH ORDINALITY AS m(role, content, metadata, ord)
+            ORDER BY m.ord
+            RETURNING id::text
+            """,
+            session_id,
+            roles,
+            contents,
+            metadata
+        )
+
+        return [row["id"] for row in results]
+
+
 async def get_session_messages(
     session_id: str,
     limit: Optional[int] = None
@@ -260,6 +311,42 @@ async def get_session_messages(
         ]
 
 
+async def get_recent_messages(
+    session_id: str,
+    limit: int
+) -> List[Dict[str, str]]:
+    """
+    Get the most recent messages of a session for prompt context.
+    
+    Only role and content are fetched; the newest rows are selected
+    server-side and returned oldest first.
+    
+    Args:
+        session_id: Session UUID
+        limit: Number of recent messages to return
+    
+    Returns:
+        List of role/content dicts ordered by creation time
+    """
+    async with db_pool.acquire() as conn:
+        results = await conn.fetch(
+            """
+            SELECT role, content
+            FROM messages
+            WHERE session_id = $1::uuid
+            ORDER BY created_at DESC
+            LIMIT $2
+            """,
+            session_id,
+            limit
+        )
+        
+        return [
+            {"role": row["role"], "content": row["content"]}
+            for row in reversed(results)
+        ]
+
+
 # Document Management Functions
 async def get_document(document_id: str) -> Optional[Dict[str, Any]]:
     """
@@ -366,6 +453,29 @@ async def list_documents(
         ]
 
 
+async def get_documents_version() -> str:
+    """
+    Get a cheap fingerprint of the document listing.
+    
+    Changes whenever a document is added, removed or updated, or the number
+    of chunks changes.
+    
+    Returns:
+        Version string for the documents and chunks tables
+    """
+    async with db_pool.acquire() as conn:
+        result = await conn.fetchrow(
+            """
+            SELECT
+                (SELECT count(*) FROM documents) AS document_count,
+                (SELECT coalesce(max(updated_at), 'epoch') FROM documents) AS last_updated,
+                (SELECT count(*) FROM chunks) AS chunk_count
+            """
+        )
+        
+        return f"{result['document_count']}:{result['last_updated'].isoformat()}:{result['chunk_count']}"
+
+
 # Vector Search Functions
 async def vector_search(
     embedding: List[float],
@@ -406,6 +516,53 @@ async def vector_search(
         ]
 
 
+async def vector_search_batch(
+    embeddings: List[List[float]],
+    limit: int = 10
+) -> List[List[Dict[str, Any]]]:
+    """
+    Perform vector similarity search for several embeddings in one query.
+    
+    Args:
+        embeddings: Query embedding vectors
+        limit: Maximum number of results per embedding
+    
+    Returns:
+        One list of matching chunks per embedding, ordered by similarity (best first)
+    """
+    if not embeddings:
+        return []
+    
+    embedding_strs = ['[' + ','.join(map(str, embedding)) + ']' for embedding in embeddings]
+    
+    async with db_pool.acquire() as conn:
+        # Top-k per embedding via a lateral call to match_chunks
+        rows = await conn.fetch(
+            """
+            SELECT q.idx, m.*
+            FROM unnest($1::text[]) WITH ORDINALITY AS q(embedding, idx)
+            CROSS JOIN LATERAL match_chunks(q.embedding::vector, $2) AS m
+            ORDER BY q.idx, m.similarity DESC
+            """,
+            embedding_strs,
+            limit
+        )
+    
+    results: List[List[Dict[str, Any]]] = [[] for _ in embeddings]
+    for row in rows:
+        results[row["idx"] - 1].append({
+            "chunk_id": row["chunk_id"],
+            "document_id": row["document_id"],
+            "content": row["content"],
+            "similarity": row["similarity"],
+            "metadata": json.loads(row["metadata"]),
+            "document_title": row["document_title"],
+            "document_source": row["document_source"]
+        })
+    
+    return results
+
+
 async def hybrid_search(
     embedding: List[float],
     query_text: str,
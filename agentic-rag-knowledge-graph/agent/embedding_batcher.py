@@ -0,0 +1,149 @@
+"""
+Micro-batching of query embedding requests.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EmbedBatchFn = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+
+class EmbeddingBatcher:
+    """
+    Coalesce concurrent embedding requests into batched provider calls.
+    
+    Callers await ``embed(text)``. A background worker collects requests for
+    up to ``max_wait`` seconds (or ``max_batch_size`` items), drops duplicate
+    texts and embeds the batch with a single provider call. Until ``start()``
+    is called, ``embed`` calls the provider directly.
+    """
+    
+    def __init__(
+        self,
+        embed_batch: EmbedBatchFn,
+        max_batch_size: int = 32,
+        max_wait: float = 0.005
+    ):
+        """
+        Initialize batcher.
+        
+        Args:
+            embed_batch: Coroutine embedding a list of texts in order
+            max_batch_size: Maximum texts collected per batch
+            max_wait: Seconds to wait for more requests after the first
+        """
+        self._embed_batch = embed_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._inflight: set = set()
+    
+    def start(self) -> None:
+        """Start the background worker on the running loop."""
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Stop the worker and let in-flight batches finish."""
+        if self._worker is None:
+            return
+        
+        self._worker.cancel()
+        await asyncio.gather(self._worker, return_exceptions=True)
+        self._worker = None
+        
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        
+        # Fail anything that was queued but never collected
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Embedding batcher stopped"))
+        self._queue = None
+    
+    async def embed(self, text: str) -> List[float]:
+        """
+        Embed a single text, batched with concurrent callers.
+        
+        Args:
+            text: Text to embed
+        
+        Returns:
+            Embedding vector
+        """
+        if self._worker is None:
+            embeddings = await self._embed_batch([text])
+            return embeddings[0]
+        
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((text, future))
+        return await future
+    
+    async def _collect(self) -> List[Tuple[str, asyncio.Future]]:
+        """Wait for one request, then gather more until full or timed out."""
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        
+        try:
+            while len(batch) < self.max_batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+        except asyncio.CancelledError:
+            # Stopped mid-collection: these requests are off the queue and
+            # not in flight, so fail them rather than leave callers waiting
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(RuntimeError("Embedding batcher stopped"))
+            raise
+        
+        return batch
+    
+    async def _run(self) -> None:
+        """Collect batches and dispatch them without waiting on the provider."""
+        while True:
+            batch = await self._collect()
+            
+            waiters: Dict[str, List[asyncio.Future]] = {}
+            for text, future in batch:
+                if not future.done():
+                    waiters.setdefault(text, []).append(future)
+            
+            if waiters:
+                task = asyncio.create_task(self._flush(waiters))
+                self._inflight.add(task)
+                task.add_done_callback(self._inflight.discard)
+    
+    async def _flush(self, waiters: Dict[str, List[asyncio.Future]]) -> None:
+        """Embed one deduplicated batch and resolve its futures."""
+        texts = list(waiters)
+        
+        try:
+            embeddings = await self._embed_batch(texts)
+        except Exception as e:
+            logger.error(f"Batched embedding failed: {e}")
+            for futures in waiters.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        
+        for text, embedding in zip(texts, embeddings):
+            for future in waiters[text]:
+                if not future.done():
+                    future.set_result(embedding)
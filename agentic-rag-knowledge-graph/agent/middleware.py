@@ -0,0 +1,224 @@
+"""
+Pure ASGI middleware for the agentic RAG API.
+"""
+
+import zlib
+from typing import Iterable, Optional, Tuple
+
+
+def _get_header(headers: Iterable[Tuple[bytes, bytes]], name: bytes) -> Optional[bytes]:
+    """Return the first value of a (lower-cased) header name, if present."""
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _add_vary(headers: list, value: bytes) -> None:
+    """Add a token to the Vary header, merging into an existing one."""
+    for index, (key, existing) in enumerate(headers):
+        if key.lower() == b"vary":
+            tokens = [token.strip().lower() for token in existing.split(b",")]
+            if value.lower() not in tokens and b"*" not in tokens:
+                headers[index] = (key, existing + b", " + value)
+            return
+    headers.append((b"vary", value))
+
+
+class ConditionalGZipMiddleware:
+    """
+    Gzip JSON responses without wrapping the app in BaseHTTPMiddleware.
+
+    Only ``application/json`` bodies larger than ``minimum_size`` are
+    compressed. Server-sent event streams and the excluded paths are passed
+    through untouched so tokens are flushed to the client as they arrive.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1000,
+        compresslevel: int = 6,
+        exclude_paths: Iterable[str] = ("/chat/stream", "/v1/chat/completions")
+    ):
+        """
+        Initialize middleware.
+
+        Args:
+            app: ASGI application to wrap
+            minimum_size: Minimum body size in bytes before compressing
+            compresslevel: zlib compression level
+            exclude_paths: Paths that are never compressed
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = _get_header(scope["headers"], b"accept-encoding")
+        if not accept_encoding or b"gzip" not in accept_encoding:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _GZipResponder(send, self.minimum_size, self.compresslevel)
+        await self.app(scope, receive, responder.send)
+
+
+class _GZipResponder:
+    """Per-request send wrapper that decides whether to compress."""
+
+    def __init__(self, send, minimum_size: int, compresslevel: int):
+        self._send = send
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+        self.start_message = None
+        self.compress = False
+        self.started = False
+        self.compressor = None
+
+    async def send(self, message):
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            # Hold the start message until we see the first body chunk
+            headers = message.get("headers", [])
+            content_type = _get_header(headers, b"content-type") or b""
+            self.compress = (
+                content_type.startswith(b"application/json")
+                and _get_header(headers, b"content-encoding") is None
+            )
+            if not self.compress:
+                await self._send(message)
+                self.started = True
+            else:
+                self.start_message = message
+            return
+
+        if message_type != "http.response.body" or (self.started and not self.compress):
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self.started:
+            self.started = True
+            start_message = self.start_message
+            headers = [
+                (key, value) for key, value in start_message.get("headers", [])
+                if key.lower() != b"content-length"
+            ]
+
+            if not more_body and len(body) < self.minimum_size:
+                # Too small to be worth compressing
+                self.compress = False
+                headers.append((b"content-length", str(len(body)).encode("latin-1")))
+                await self._send({**start_message, "headers": headers})
+                await self._send(message)
+                return
+
+            self.compressor = zlib.compressobj(self.compresslevel, zlib.DEFLATED, 31)
+            headers.append((b"content-encoding", b"gzip"))
+            _add_vary(headers, b"Accept-Encoding")
+
+            if not more_body:
+                compressed = self.compressor.compress(body) + self.compressor.flush()
+                headers.append((b"content-length", str(len(compressed)).encode("latin-1")))
+                await self._send({**start_message, "headers": headers})
+                await self._send({"type": "http.response.body", "body": compressed})
+                return
+
+            await self._send({**start_message, "headers": headers})
+
+        if more_body:
+            compressed = self.compressor.compress(body) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+        else:
+            compressed = self.compressor.compress(body) + self.compressor.flush()
+
+        await self._send({
+            "type": "http.response.body",
+            "body": compressed,
+            "more_body": more_body
+        })
+
+
+class FastCORSMiddleware:
+    """
+    Allow-all CORS without per-request origin matching.
+
+    Emits fixed CORS headers on every response and answers preflight
+    requests directly, without routing them into the app. Mirrors Starlette's
+    allow-all behaviour: the request origin is echoed back only when a cookie
+    is sent, since browsers reject ``*`` for credentialed requests.
+    """
+
+    ALLOW_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+    MAX_AGE = b"600"
+
+    def __init__(self, app):
+        """
+        Initialize middleware.
+
+        Args:
+            app: ASGI application to wrap
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = scope["headers"]
+        origin = _get_header(request_headers, b"origin")
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        if (
+            scope["method"] == "OPTIONS"
+            and _get_header(request_headers, b"access-control-request-method") is not None
+        ):
+            await self._preflight(origin, request_headers, send)
+            return
+
+        if _get_header(request_headers, b"cookie") is not None:
+            cors_headers = [
+                (b"access-control-allow-origin", origin),
+                (b"access-control-allow-credentials", b"true"),
+                (b"vary", b"Origin"),
+            ]
+        else:
+            cors_headers = [
+                (b"access-control-allow-origin", b"*"),
+                (b"access-control-allow-credentials", b"true"),
+            ]
+
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": list(message.get("headers", [])) + cors_headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    async def _preflight(self, origin: bytes, request_headers, send):
+        """Answer a CORS preflight request."""
+        headers = [
+            (b"access-control-allow-origin", origin),
+            (b"access-control-allow-credentials", b"true"),
+            (b"access-control-allow-methods", self.ALLOW_METHODS),
+            (b"access-control-max-age", self.MAX_AGE),
+            (b"vary", b"Origin"),
+            (b"content-length", b"0"),
+        ]
+        requested_headers = _get_header(request_headers, b"access-control-request-headers")
+        if requested_headers is not None:
+            headers.append((b"access-control-allow-headers", requested_headers))
+
+        await send({"type": "http.response.start", "status": 204, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
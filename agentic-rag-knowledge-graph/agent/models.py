@@ -45,6 +45,12 @@ class SearchRequest(BaseModel):
     model_config = ConfigDict(use_enum_values=True)
 
 
+class BatchSearchRequest(BaseModel):
+    """Batch vector search request model."""
+    queries: List[str] = Field(..., min_length=1, max_length=32, description="Search queries")
+    limit: int = Field(default=10, ge=1, le=50, description="Maximum results per query")
+
+
 # Response Models
 class DocumentMetadata(BaseModel):
     """Document metadata model."""
@@ -100,6 +106,13 @@ class SearchResponse(BaseModel):
     query_time_ms: float
 
 
+class BatchSearchResponse(BaseModel):
+    """Batch vector search response model."""
+    results: List[List[ChunkResult]] = Field(default_factory=list)
+    total_results: int = 0
+    query_time_ms: float
+
+
 class ToolCall(BaseModel):
     """Tool call information model."""
     tool_name: str
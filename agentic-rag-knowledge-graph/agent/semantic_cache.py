@@ -0,0 +1,260 @@
+"""
+Semantic cache for search results keyed by query embedding.
+"""
+
+import itertools
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from threading import RLock
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Rows added to the embedding matrix each time it runs out of space
+GROW_ROWS = 256
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize query text for exact-match cache lookups.
+    
+    Applies NFKC, lower-cases and collapses whitespace so that trivially
+    different spellings of the same query share a cache key.
+    
+    Args:
+        query: Raw query text
+    
+    Returns:
+        Normalized query text
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", query)).strip().lower()
+
+
+class SemanticCache:
+    """
+    Cache search results for queries with near-identical embeddings.
+    
+    Embeddings are stored unit-normalized in a preallocated, contiguous
+    float32 matrix so a lookup is one matrix-vector product followed by an
+    argmax. Entries expire after ``ttl`` seconds and the least recently used
+    entry is evicted once ``max_entries`` is reached; removed rows are filled
+    by swapping in the last row so nothing is shifted.
+    
+    Query texts seen for an entry are also indexed by their normalized form,
+    so repeats can be served with ``get_text`` before embedding the query.
+    """
+    
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        ttl: float = 300,
+        max_entries: int = 1024
+    ):
+        """
+        Initialize cache.
+        
+        Args:
+            threshold: Minimum cosine similarity for a cache hit
+            ttl: Seconds before an entry expires (0 disables the cache)
+            max_entries: Maximum number of cached queries
+        """
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = RLock()
+        self._ids = itertools.count()
+        self._matrix: Optional[np.ndarray] = None
+        self._size = 0
+        # Entry id stored in each matrix row
+        self._row_ids: List[int] = []
+        # Entry id -> [row, limit, results, created_at, texts], oldest use first
+        self._entries: "OrderedDict[int, list]" = OrderedDict()
+        # Normalized query text -> entry id
+        self._texts: Dict[str, int] = {}
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        """Return the embedding as a unit-length float32 vector."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def _best_match(self, query: np.ndarray) -> tuple[int, float]:
+        """Return (row, score) of the most similar cached embedding."""
+        if not self._size or self._matrix.shape[1] != query.shape[0]:
+            return -1, -1.0
+        
+        scores = self._matrix[:self._size] @ query
+        row = int(scores.argmax())
+        return row, float(scores[row])
+    
+    def _append(self, query: np.ndarray, entry_id: int) -> int:
+        """Write an embedding into the next free row, growing if needed."""
+        if self._matrix is None:
+            self._matrix = np.empty((GROW_ROWS, query.shape[0]), dtype=np.float32)
+        elif self._size == self._matrix.shape[0]:
+            grown = np.empty((self._size + GROW_ROWS, self._matrix.shape[1]), dtype=np.float32)
+            grown[:self._size] = self._matrix
+            self._matrix = grown
+        
+        row = self._size
+        self._matrix[row] = query
+        self._row_ids.append(entry_id)
+        self._size += 1
+        return row
+    
+    def _remove(self, row: int) -> None:
+        """Drop a row by moving the last row into its slot."""
+        entry_id = self._row_ids[row]
+        last = self._size - 1
+        
+        if row != last:
+            self._matrix[row] = self._matrix[last]
+            moved_id = self._row_ids[last]
+            self._row_ids[row] = moved_id
+            self._entries[moved_id][0] = row
+        
+        self._row_ids.pop()
+        for text in self._entries.pop(entry_id)[4]:
+            if self._texts.get(text) == entry_id:
+                del self._texts[text]
+        self._size -= 1
+    
+    def _use_entry(self, entry_id: int, limit: int) -> Optional[List[Any]]:
+        """Return an entry's results if it is fresh and covers the limit."""
+        row, cached_limit, results, created_at, _ = self._entries[entry_id]
+        if time.monotonic() - created_at > self.ttl:
+            self._remove(row)
+            return None
+        
+        # Results are ranked, so a larger cached limit covers smaller ones
+        if limit > cached_limit:
+            return None
+        
+        self._entries.move_to_end(entry_id)
+        return results[:limit]
+    
+    def get_text(self, text: str, limit: int) -> Optional[List[Any]]:
+        """
+        Look up cached results by normalized query text.
+        
+        Args:
+            text: Query text
+            limit: Number of results requested
+        
+        Returns:
+            Cached results, or None on a miss
+        """
+        if self.ttl <= 0:
+            return None
+        
+        with self._lock:
+            entry_id = self._texts.get(normalize_query(text))
+            if entry_id is None:
+                return None
+            return self._use_entry(entry_id, limit)
+    
+    def get(
+        self,
+        embedding: List[float],
+        limit: int,
+        text: Optional[str] = None
+    ) -> Optional[List[Any]]:
+        """
+        Look up cached results for a query embedding.
+        
+        Args:
+            embedding: Query embedding
+            limit: Number of results requested
+            text: Query text to index against the matched entry on a hit
+        
+        Returns:
+            Cached results, or None on a miss
+        """
+        if self.ttl <= 0:
+            return None
+        
+        query = self._normalize(embedding)
+        
+        with self._lock:
+            row, score = self._best_match(query)
+            if row < 0 or score < self.threshold:
+                return None
+            
+            entry_id = self._row_ids[row]
+            results = self._use_entry(entry_id, limit)
+            if results is not None and text is not None:
+                self._add_text(entry_id, text)
+            return results
+    
+    def _add_text(self, entry_id: int, text: str) -> None:
+        """Index a query text against an entry."""
+        key = normalize_query(text)
+        previous = self._texts.get(key)
+        if previous is not None and previous != entry_id:
+            self._entries[previous][4].discard(key)
+        self._texts[key] = entry_id
+        self._entries[entry_id][4].add(key)
+    
+    def set(
+        self,
+        embedding: List[float],
+        limit: int,
+        results: List[Any],
+        text: Optional[str] = None
+    ) -> None:
+        """
+        Store results for a query embedding.
+        
+        Args:
+            embedding: Query embedding
+            limit: Number of results requested
+            results: Ranked search results
+            text: Query text to index for exact-match lookups
+        """
+        if self.ttl <= 0:
+            return
+        
+        query = self._normalize(embedding)
+        now = time.monotonic()
+        
+        with self._lock:
+            if self._matrix is not None and self._matrix.shape[1] != query.shape[0]:
+                # Embedding model changed; nothing cached is comparable
+                self.clear()
+            
+            row, score = self._best_match(query)
+            if row >= 0 and score >= self.threshold:
+                # Refresh the existing entry instead of adding a near-duplicate
+                entry_id = self._row_ids[row]
+                entry = self._entries[entry_id]
+                self._matrix[row] = query
+                entry[1:4] = [limit, results, now]
+                self._entries.move_to_end(entry_id)
+            else:
+                if self._size >= self.max_entries:
+                    lru_id = next(iter(self._entries))
+                    self._remove(self._entries[lru_id][0])
+                
+                entry_id = next(self._ids)
+                row = self._append(query, entry_id)
+                self._entries[entry_id] = [row, limit, results, now, set()]
+            
+            if text is not None:
+                self._add_text(entry_id, text)
+    
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        with self._lock:
+            self._matrix = None
+            self._size = 0
+            self._row_ids = []
+            self._entries = OrderedDict()
+            self._texts = {}
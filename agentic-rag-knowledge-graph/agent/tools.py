@@ -13,6 +13,7 @@ from dotenv import load_dotenv
 
 from .db_utils import (
     vector_search,
+    vector_search_batch,
     hybrid_search,
     get_document,
     list_documents,
@@ -57,6 +58,27 @@ async def generate_embedding(text: str) -> List[float]:
         raise
 
 
+async def generate_embeddings(texts: List[str]) -> List[List[float]]:
+    """
+    Generate embeddings for several texts in one provider call.
+    
+    Args:
+        texts: Texts to embed
+    
+    Returns:
+        Embedding vectors in input order
+    """
+    try:
+        response = await embedding_client.embeddings.create(
+            model=EMBEDDING_MODEL,
+            input=texts
+        )
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+    except Exception as e:
+        logger.error(f"Failed to generate embeddings: {e}")
+        raise
+
+
 # Tool Input Models
 class VectorSearchInput(BaseModel):
     """Input for vector search tool."""
@@ -101,19 +123,24 @@ class EntityTimelineInput(BaseModel):
 
 
 # Tool Implementation Functions
-async def vector_search_tool(input_data: VectorSearchInput) -> List[ChunkResult]:
+async def vector_search_tool(
+    input_data: VectorSearchInput,
+    embedding: Optional[List[float]] = None
+) -> List[ChunkResult]:
     """
     Perform vector similarity search.
     
     Args:
         input_data: Search parameters
+        embedding: Precomputed query embedding, generated if not given
     
     Returns:
         List of matching chunks
     """
     try:
         # Generate embedding for the query
-        embedding = await generate_embedding(input_data.query)
+        if embedding is None:
+            embedding = await generate_embedding(input_data.query)
         
         # Perform vector search
         results = await vector_search(
@@ -140,6 +167,49 @@ async def vector_search_tool(input_data: VectorSearchInput) -> List[ChunkResult]
         return []
 
 
+async def vector_search_batch_tool(queries: List[str], limit: int = 10) -> List[List[ChunkResult]]:
+    """
+    Perform vector similarity search for several queries at once.
+    
+    Duplicate queries are embedded and searched once, with a single
+    embedding call and a single database query for the whole batch.
+    
+    Args:
+        queries: Search queries
+        limit: Maximum number of results per query
+    
+    Returns:
+        One list of matching chunks per query, in query order
+    """
+    try:
+        unique_queries = list(dict.fromkeys(queries))
+        
+        embeddings = await generate_embeddings(unique_queries)
+        batch_results = await vector_search_batch(embeddings=embeddings, limit=limit)
+        
+        by_query = {
+            query: [
+                ChunkResult(
+                    chunk_id=str(r["chunk_id"]),
+                    document_id=str(r["document_id"]),
+                    content=r["content"],
+                    score=r["similarity"],
+                    metadata=r["metadata"],
+                    document_title=r["document_title"],
+                    document_source=r["document_source"]
+                )
+                for r in results
+            ]
+            for query, results in zip(unique_queries, batch_results)
+        }
+        
+        return [by_query[query] for query in queries]
+        
+    except Exception as e:
+        logger.error(f"Batch vector search failed: {e}")
+        return [[] for _ in queries]
+
+
 async def graph_search_tool(input_data: GraphSearchInput) -> List[GraphSearchResult]:
     """
     Search the knowledge graph.
@@ -172,19 +242,24 @@ async def graph_search_tool(input_data: GraphSearchInput) -> List[GraphSearchRes
         return []
 
 
-async def hybrid_search_tool(input_data: HybridSearchInput) -> List[ChunkResult]:
+async def hybrid_search_tool(
+    input_data: HybridSearchInput,
+    embedding: Optional[List[float]] = None
+) -> List[ChunkResult]:
     """
     Perform hybrid search (vector + keyword).
     
     Args:
         input_data: Search parameters
+        embedding: Precomputed query embedding, generated if not given
     
     Returns:
         List of matching chunks
     """
     try:
         # Generate embedding for the query
-        embedding = await generate_embedding(input_data.query)
+        if embedding is None:
+            embedding = await generate_embedding(input_data.query)
         
         # Perform hybrid search
         results = await hybrid_search(
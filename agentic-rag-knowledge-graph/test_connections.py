@@ -6,11 +6,25 @@ import asyncio
 import os
 from dotenv import load_dotenv
 import asyncpg
-from neo4j import GraphDatabase
+from neo4j import AsyncGraphDatabase
 
 # Load environment variables
 load_dotenv()
 
+# Shared async Neo4j driver, created on first use
+_neo4j_driver = None
+
+def get_neo4j_driver():
+    """Return the shared async Neo4j driver."""
+    global _neo4j_driver
+    if _neo4j_driver is None:
+        _neo4j_driver = AsyncGraphDatabase.driver(
+            os.getenv("NEO4J_URI"),
+            auth=(os.getenv("NEO4J_USER"), os.getenv("NEO4J_PASSWORD")),
+            max_connection_pool_size=10
+        )
+    return _neo4j_driver
+
 async def test_postgres_connection():
     """Test PostgreSQL connection via Supabase pooler."""
     try:
@@ -19,24 +33,24 @@ async def test_postgres_connection():
         
         conn = await asyncpg.connect(database_url)
         
-        # Test basic query
-        result = await conn.fetchrow("SELECT 1 as test, version() as pg_version")
+        # Run all checks in a single round trip
+        result = await conn.fetchrow("""
+            SELECT
+                1 as test,
+                version() as pg_version,
+                ARRAY(
+                    SELECT table_name::text FROM information_schema.tables 
+                    WHERE table_schema = 'public' 
+                    AND table_name IN ('documents', 'chunks', 'sessions', 'messages')
+                    ORDER BY table_name
+                ) as tables,
+                vector('[1,2,3]') as test_vector
+        """)
         print(f"✅ PostgreSQL connected successfully!")
         print(f"   Test query result: {result['test']}")
         print(f"   PostgreSQL version: {result['pg_version'][:50]}...")
-        
-        # Test our tables exist
-        tables = await conn.fetch("""
-            SELECT table_name FROM information_schema.tables 
-            WHERE table_schema = 'public' 
-            AND table_name IN ('documents', 'chunks', 'sessions', 'messages')
-            ORDER BY table_name
-        """)
-        print(f"   Our tables: {[row['table_name'] for row in tables]}")
-        
-        # Test vector extension
-        vector_check = await conn.fetchrow("SELECT vector('[1,2,3]') as test_vector")
-        print(f"   Vector extension working: {vector_check['test_vector']}")
+        print(f"   Our tables: {result['tables']}")
+        print(f"   Vector extension working: {result['test_vector']}")
         
         await conn.close()
         return True
@@ -45,31 +59,26 @@ async def test_postgres_connection():
         print(f"❌ PostgreSQL connection failed: {e}")
         return False
 
-def test_neo4j_connection():
+async def test_neo4j_connection():
     """Test Neo4j connection."""
     try:
-        neo4j_uri = os.getenv("NEO4J_URI")
-        neo4j_user = os.getenv("NEO4J_USER")
-        neo4j_password = os.getenv("NEO4J_PASSWORD")
-        
-        print(f"Testing Neo4j connection to: {neo4j_uri}")
+        print(f"Testing Neo4j connection to: {os.getenv('NEO4J_URI')}")
         
-        driver = GraphDatabase.driver(neo4j_uri, auth=(neo4j_user, neo4j_password))
+        driver = get_neo4j_driver()
         
         # Test basic query
-        with driver.session() as session:
-            result = session.run("RETURN 1 as test, 'Neo4j connected!' as message")
-            record = result.single()
+        async with driver.session() as session:
+            result = await session.run("RETURN 1 as test, 'Neo4j connected!' as message")
+            record = await result.single()
             print(f"✅ Neo4j connected successfully!")
             print(f"   Test query result: {record['test']}")
             print(f"   Message: {record['message']}")
             
             # Check database info
-            db_info = session.run("CALL dbms.components() YIELD name, versions")
-            for record in db_info:
+            db_info = await session.run("CALL dbms.components() YIELD name, versions")
+            async for record in db_info:
                 print(f"   {record['name']}: {record['versions'][0]}")
         
-        driver.close()
         return True
         
     except Exception as e:
@@ -81,10 +90,15 @@ async def main():
     print("🔌 Testing Database Connections...\n")
     
     print("=" * 50)
-    postgres_ok = await test_postgres_connection()
-    
-    print("\n" + "=" * 50)
-    neo4j_ok = test_neo4j_connection()
+    try:
+        # Both checks are network-bound; run them side by side
+        postgres_ok, neo4j_ok = await asyncio.gather(
+            test_postgres_connection(),
+            test_neo4j_connection()
+        )
+    finally:
+        if _neo4j_driver is not None:
+            await _neo4j_driver.close()
     
     print("\n" + "=" * 50)
     print("📊 Summary:")
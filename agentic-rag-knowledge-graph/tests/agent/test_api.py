@@ -0,0 +1,429 @@
+"""
+Tests for API helper functions.
+"""
+
+import json
+import logging
+from unittest.mock import AsyncMock, Mock, patch
+
+import orjson
+import pytest
+from cachetools import TTLCache
+from fastapi import HTTPException
+
+from agent.api import (
+    _CONTENT_PLACEHOLDER,
+    _context_cache,
+    SSE_DONE,
+    TokenCoalescer,
+    build_prompt,
+    build_sse_template,
+    cached_search,
+    cached_text_search,
+    chat_stream,
+    configure_app,
+    convert_openai_to_internal,
+    create_openai_response,
+    documents_etag,
+    execute_agent,
+    format_sse,
+    get_conversation_context_str,
+    global_exception_handler,
+    openai_json_response,
+    openai_model_settings,
+    search_json_response,
+    update_conversation_context
+)
+from agent.models import (
+    ChatRequest,
+    ChunkResult,
+    ErrorResponse,
+    OpenAIChatRequest,
+    OpenAIChatResponse,
+    SearchResponse,
+    SearchType
+)
+from agent.semantic_cache import SemanticCache
+
+
+class TestConfigureApp:
+    """Test per-process configuration."""
+    
+    @pytest.fixture(autouse=True)
+    def restore_config(self, monkeypatch):
+        import agent.api as api
+        for name in (
+            "APP_ENV", "MEMORY_ENABLED", "STREAMING_ENABLED", "SESSION_CACHE_TTL",
+            "SEARCH_CACHE_TTL", "SEARCH_CACHE_THRESHOLD", "_session_cache", "_context_cache",
+            "_hybrid_search_cache"
+        ):
+            monkeypatch.setattr(api, name, getattr(api, name))
+        monkeypatch.setattr(api._vector_search_cache, "ttl", api._vector_search_cache.ttl)
+        monkeypatch.setattr(api._vector_search_cache, "threshold", api._vector_search_cache.threshold)
+    
+    def test_cache_settings_read_at_configure(self, monkeypatch):
+        """Test cache settings come from the environment at configure time."""
+        import agent.api as api
+        monkeypatch.setenv("SESSION_CACHE_TTL", "5")
+        monkeypatch.setenv("SEARCH_CACHE_TTL", "7")
+        monkeypatch.setenv("SEARCH_CACHE_THRESHOLD", "0.9")
+        
+        configure_app()
+        
+        assert api._session_cache.ttl == api._context_cache.ttl == 5
+        assert api._vector_search_cache.ttl == api._hybrid_search_cache.ttl == 7
+        assert api._vector_search_cache.threshold == 0.9
+    
+    def test_development_does_not_force_debug(self, monkeypatch):
+        """Test LOG_LEVEL, not APP_ENV, decides the module's verbosity."""
+        monkeypatch.setenv("APP_ENV", "development")
+        
+        configure_app()
+        
+        assert logging.getLogger("agent.api").level == logging.NOTSET
+
+
+class TestSSEFraming:
+    """Test Server-Sent Events frame encoding."""
+
+    def test_format_sse(self):
+        """Test payloads are framed as a single data event."""
+        frame = format_sse({"type": "end"})
+
+        assert frame == b'data: {"type":"end"}\n\n'
+
+    def test_done_frame(self):
+        """Test the OpenAI stream terminator."""
+        assert SSE_DONE == b"data: [DONE]\n\n"
+
+    def test_build_sse_template_matches_format_sse(self):
+        """Test spliced frames equal fully serialized frames."""
+        envelope = {
+            "id": "chatcmpl-1234",
+            "object": "chat.completion.chunk",
+            "created": 1700000000,
+            "model": 'model "quoted"',
+            "choices": [{
+                "index": 0,
+                "delta": {"content": _CONTENT_PLACEHOLDER},
+                "finish_reason": None
+            }]
+        }
+        prefix, suffix = build_sse_template(envelope)
+
+        content = 'Hello "world"\né'
+        frame = prefix + orjson.dumps(content) + suffix
+
+        envelope["choices"][0]["delta"]["content"] = content
+        assert frame == format_sse(envelope)
+        assert json.loads(frame[len(b"data: "):-2])["choices"][0]["delta"]["content"] == content
+
+
+class TestOpenAIResponse:
+    """Test OpenAI-compatible response construction."""
+
+    def test_convert_uses_latest_user_message(self):
+        """Test the last user message is picked from the history."""
+        request = OpenAIChatRequest(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": "Be brief"},
+                {"role": "user", "content": "First"},
+                {"role": "assistant", "content": "Reply"},
+                {"role": "user", "content": "Second"},
+                {"role": "assistant", "content": "Trailing"}
+            ],
+            user="user-1"
+        )
+        
+        assert convert_openai_to_internal(request) == ("Second", "user-1")
+    
+    def test_convert_without_user_message(self):
+        """Test requests with no user turn are rejected."""
+        request = OpenAIChatRequest(
+            model="gpt-4o-mini",
+            messages=[{"role": "system", "content": "Be brief"}]
+        )
+        
+        with pytest.raises(HTTPException) as exc_info:
+            convert_openai_to_internal(request)
+        
+        assert exc_info.value.status_code == 400
+    
+    def test_model_settings_only_explicit_fields(self):
+        """Test only sampling fields the client set are forwarded."""
+        request = OpenAIChatRequest(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": "Hi"}],
+            max_tokens=1,
+            temperature=0.0
+        )
+        
+        assert openai_model_settings(request) == {"max_tokens": 1, "temperature": 0.0}
+    
+    @pytest.mark.asyncio
+    async def test_execute_agent_forwards_model_settings(self):
+        """Test model settings reach the agent run."""
+        result = Mock(data="Hi", all_messages=Mock(return_value=[]))
+        with patch('agent.api.get_conversation_context_str', new_callable=AsyncMock) as mock_context, \
+             patch('agent.api.rag_agent.run', new_callable=AsyncMock) as mock_run:
+            mock_context.return_value = ""
+            mock_run.return_value = result
+            
+            response, _ = await execute_agent(
+                "Hello", "session-123", save_conversation=False,
+                model_settings={"max_tokens": 1}
+            )
+        
+        assert response == "Hi"
+        assert mock_run.await_args.kwargs["model_settings"] == {"max_tokens": 1}
+    
+    def test_model_settings_none_by_default(self):
+        """Test request-model defaults do not override the agent's settings."""
+        request = OpenAIChatRequest(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": "Hi"}]
+        )
+        
+        assert openai_model_settings(request) is None
+    
+    def test_create_openai_response(self):
+        """Test non-streaming response fields."""
+        response = create_openai_response("Hello world", "session-123", model="gpt-4o-mini")
+
+        assert response.object == "chat.completion"
+        assert response.id.startswith("chatcmpl-")
+        assert response.choices[0].message.content == "Hello world"
+        assert response.choices[0].finish_reason == "stop"
+        assert response.usage.completion_tokens == 3
+        assert response.usage.total_tokens == 53
+
+    def test_openai_json_response_is_valid(self):
+        """Test serialized body round-trips through model validation."""
+        response = create_openai_response("Hello world", "session-123")
+
+        http_response = openai_json_response(response)
+
+        assert http_response.media_type == "application/json"
+        parsed = OpenAIChatResponse.model_validate_json(http_response.body)
+        assert parsed.choices[0].message.content == "Hello world"
+
+
+class TestSearchResponse:
+    """Test search response serialization."""
+    
+    def test_search_json_response_is_valid(self):
+        """Test serialized body round-trips through model validation."""
+        chunk = ChunkResult(
+            chunk_id="chunk-1",
+            document_id="doc-1",
+            content="Some content",
+            score=0.9,
+            document_title="Title",
+            document_source="source.md"
+        )
+        search_response = SearchResponse.model_construct(
+            results=[chunk],
+            total_results=1,
+            search_type=SearchType.VECTOR,
+            query_time_ms=1.5
+        )
+        
+        http_response = search_json_response(search_response)
+        
+        assert http_response.media_type == "application/json"
+        parsed = SearchResponse.model_validate_json(http_response.body)
+        assert parsed.results == [chunk]
+        assert parsed.graph_results == []
+        assert parsed.search_type == SearchType.VECTOR
+
+
+class TestSearchCaching:
+    """Test cached search helpers."""
+    
+    @pytest.mark.asyncio
+    async def test_embedding_failure_returns_empty(self):
+        """Test provider errors give empty results like the search tools do."""
+        search_tool = AsyncMock()
+        input_data = Mock(query="What is RAG?", limit=10)
+        with patch('agent.api.embedding_batcher.embed', new_callable=AsyncMock) as mock_embed:
+            mock_embed.side_effect = RuntimeError("provider down")
+            
+            assert await cached_search(SemanticCache(), search_tool, input_data) == []
+            assert await cached_text_search(TTLCache(maxsize=8, ttl=60), search_tool, input_data) == []
+        
+        search_tool.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_text_search_reuses_same_text_only(self):
+        """Test hybrid results are not shared between different wordings."""
+        cache = TTLCache(maxsize=8, ttl=60)
+        search_tool = AsyncMock(side_effect=lambda input_data, embedding: [input_data.query])
+        with patch('agent.api.embedding_batcher.embed', new_callable=AsyncMock) as mock_embed:
+            mock_embed.return_value = [1.0, 0.0]
+            
+            first = await cached_text_search(cache, search_tool, Mock(query="What is RAG?", limit=10))
+            repeat = await cached_text_search(cache, search_tool, Mock(query="what is  rag?", limit=5))
+            reworded = await cached_text_search(cache, search_tool, Mock(query="Explain RAG", limit=10))
+        
+        assert first == repeat == ["What is RAG?"]
+        assert reworded == ["Explain RAG"]
+        assert search_tool.await_count == 2
+
+
+class TestDocumentsETag:
+    """Test document listing ETags."""
+    
+    def test_etag_is_quoted_and_stable(self):
+        """Test identical inputs give the same quoted tag."""
+        etag = documents_etag("2:2024-01-01T00:00:00+00:00:8", 20, 0)
+        
+        assert etag.startswith('"') and etag.endswith('"')
+        assert etag == documents_etag("2:2024-01-01T00:00:00+00:00:8", 20, 0)
+    
+    def test_etag_varies_with_version_and_page(self):
+        """Test data changes and different pages change the tag."""
+        etag = documents_etag("2:2024-01-01T00:00:00+00:00:8", 20, 0)
+        
+        assert etag != documents_etag("3:2024-01-02T00:00:00+00:00:9", 20, 0)
+        assert etag != documents_etag("2:2024-01-01T00:00:00+00:00:8", 20, 20)
+
+
+class TestTokenCoalescer:
+    """Test stream token coalescing."""
+
+    def test_first_token_released_immediately(self):
+        """Test time-to-first-token is not delayed."""
+        coalescer = TokenCoalescer(window=60)
+
+        assert coalescer.add("Hello") == "Hello"
+
+    def test_tokens_buffered_within_window(self):
+        """Test later tokens are joined into one frame."""
+        coalescer = TokenCoalescer(window=60)
+        coalescer.add("Hello")
+
+        assert coalescer.add(" wor") is None
+        assert coalescer.add("ld") is None
+        assert coalescer.flush() == " world"
+        assert coalescer.flush() is None
+
+    def test_buffer_released_at_max_chars(self):
+        """Test large buffers are released without waiting for the window."""
+        coalescer = TokenCoalescer(window=60, max_chars=5)
+        coalescer.add("a")
+
+        assert coalescer.add("bc") is None
+        assert coalescer.add("def") == "bcdef"
+
+    def test_zero_window_releases_every_token(self):
+        """Test a zero window disables coalescing."""
+        coalescer = TokenCoalescer(window=0)
+
+        assert [coalescer.add(t) for t in ("a", "b", "c")] == ["a", "b", "c"]
+
+
+class TestConversationContext:
+    """Test cached conversation context."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        _context_cache.clear()
+        yield
+        _context_cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_context_str_cached(self):
+        """Test context is loaded once and then served from cache."""
+        messages = [
+            {"role": "user", "content": "Hello"},
+            {"role": "assistant", "content": "Hi there!"}
+        ]
+        with patch('agent.api.get_recent_messages', new_callable=AsyncMock) as mock_get:
+            mock_get.return_value = messages
+
+            first = await get_conversation_context_str("session-123")
+            second = await get_conversation_context_str("session-123")
+
+            assert first == second == "user: Hello\nassistant: Hi there!"
+            mock_get.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_update_appends_new_turn(self):
+        """Test stored turns are appended to the cached context."""
+        with patch('agent.api.get_recent_messages', new_callable=AsyncMock) as mock_get:
+            mock_get.return_value = [{"role": "user", "content": "First"}]
+            await get_conversation_context_str("session-123")
+
+            snapshot = _context_cache.get("session-123")
+            update_conversation_context(
+                "session-123",
+                [
+                    {"role": "user", "content": "Second"},
+                    {"role": "assistant", "content": "Reply"}
+                ],
+                snapshot
+            )
+
+            context_str = await get_conversation_context_str("session-123")
+
+            assert context_str == "user: First\nuser: Second\nassistant: Reply"
+            mock_get.assert_called_once()
+
+    def test_update_without_snapshot_invalidates(self):
+        """Test entries cached during a write are dropped."""
+        _context_cache["session-123"] = (6, [], "")
+
+        update_conversation_context(
+            "session-123",
+            [{"role": "user", "content": "Hello"}],
+            None
+        )
+
+        assert "session-123" not in _context_cache
+
+    def test_build_prompt(self):
+        """Test prompt assembly with and without context."""
+        assert build_prompt("Question?", "") == "Question?"
+        assert build_prompt("Question?", "user: Hi") == (
+            "Previous conversation:\nuser: Hi\n\nCurrent question: Question?"
+        )
+
+
+class TestChatStream:
+    """Test /chat/stream persistence."""
+    
+    @pytest.mark.asyncio
+    async def test_user_turn_kept_on_disconnect(self):
+        """Test the user message is stored when the client leaves mid-stream."""
+        with patch('agent.api.get_or_create_session', new_callable=AsyncMock) as mock_session, \
+             patch('agent.api.get_conversation_context_str', new_callable=AsyncMock) as mock_context, \
+             patch('agent.api.persist_messages', new_callable=Mock) as mock_persist, \
+             patch('agent.api.schedule_write') as mock_schedule:
+            mock_session.return_value = "session-123"
+            mock_context.return_value = ""
+            
+            response = await chat_stream(ChatRequest(message="Hello", user_id="user-1"))
+            stream = response.body_iterator
+            await stream.__anext__()
+            await stream.aclose()
+        
+        mock_schedule.assert_called_once()
+        session_id, rows = mock_persist.call_args.args
+        assert session_id == "session-123"
+        assert [row["content"] for row in rows] == ["Hello"]
+
+
+class TestErrorHandling:
+    """Test the global exception handler."""
+    
+    @pytest.mark.asyncio
+    async def test_unhandled_exception_response(self):
+        """Test unhandled errors become a 500 ErrorResponse body."""
+        response = await global_exception_handler(None, ValueError("boom"))
+        
+        assert response.status_code == 500
+        error = ErrorResponse.model_validate_json(response.body)
+        assert error.error == "boom"
+        assert error.error_type == "ValueError"
+        assert len(error.request_id) == 32
@@ -14,10 +14,14 @@ from agent.db_utils import (
     get_session,
     update_session,
     add_message,
+    add_messages_bulk,
     get_session_messages,
+    get_recent_messages,
     get_document,
     list_documents,
+    get_documents_version,
     vector_search,
+    vector_search_batch,
     hybrid_search,
     get_document_chunks,
     test_connection as db_test_connection
@@ -203,6 +207,46 @@ class TestMessageManagement:
             assert call_args[0][2] == "user"  # role
             assert call_args[0][3] == "Hello"  # content
     
+    @pytest.mark.asyncio
+    async def test_add_messages_bulk(self):
+        """Test adding several messages in one statement."""
+        with patch('agent.db_utils.db_pool') as mock_pool:
+            mock_conn = AsyncMock()
+            mock_conn.fetch.return_value = [{"id": "message-1"}, {"id": "message-2"}]
+            mock_pool.acquire.return_value.__aenter__ = AsyncMock(return_value=mock_conn)
+            mock_pool.acquire.return_value.__aexit__ = AsyncMock(return_value=None)
+            
+            message_ids = await add_messages_bulk(
+                session_id="session-123",
+                messages=[
+                    {"role": "user", "content": "Hello", "metadata": {"client": "web"}},
+                    {"role": "assistant", "content": "Hi there!"}
+                ]
+            )
+            
+            assert message_ids == ["message-1", "message-2"]
+            mock_conn.fetch.assert_called_once()
+            
+            # Check the SQL call
+            call_args = mock_conn.fetch.call_args
+            assert "INSERT INTO messages" in call_args[0][0]
+            assert "unnest($2::text[], $3::text[], $4::text[])" in call_args[0][0]
+            assert call_args[0][1:] == (
+                "session-123",
+                ["user", "assistant"],
+                ["Hello", "Hi there!"],
+                ['{"client": "web"}', "{}"]
+            )
+    
+    @pytest.mark.asyncio
+    async def test_add_messages_bulk_empty(self):
+        """Test empty message list skips the database."""
+        with patch('agent.db_utils.db_pool') as mock_pool:
+            message_ids = await add_messages_bulk("session-123", [])
+            
+            assert message_ids == []
+            mock_pool.acquire.assert_not_called()
+    
     @pytest.mark.asyncio
     async def test_get_session_messages(self):
         """Test getting session messages."""
@@ -235,6 +279,31 @@ class TestMessageManagement:
             assert messages[1]["role"] == "assistant"
             mock_conn.fetch.assert_called_once()
 
+    
+    @pytest.mark.asyncio
+    async def test_get_recent_messages(self):
+        """Test getting the latest messages for prompt context."""
+        with patch('agent.db_utils.db_pool') as mock_pool:
+            mock_conn = AsyncMock()
+            # Rows come back newest first
+            mock_conn.fetch.return_value = [
+                {"role": "assistant", "content": "Hi there!"},
+                {"role": "user", "content": "Hello"}
+            ]
+            mock_pool.acquire.return_value.__aenter__ = AsyncMock(return_value=mock_conn)
+            mock_pool.acquire.return_value.__aexit__ = AsyncMock(return_value=None)
+            
+            messages = await get_recent_messages("session-123", limit=6)
+            
+            assert messages == [
+                {"role": "user", "content": "Hello"},
+                {"role": "assistant", "content": "Hi there!"}
+            ]
+            
+            call_args = mock_conn.fetch.call_args
+            assert "ORDER BY created_at DESC" in call_args[0][0]
+            assert call_args[0][1:] == ("session-123", 6)
+
 
 class TestDocumentManagement:
     """Test document management functions."""
@@ -300,6 +369,24 @@ class TestDocumentManagement:
             assert len(documents) == 2
             assert documents[0]["title"] == "Document 1"
             assert documents[1]["title"] == "Document 2"
+    
+    @pytest.mark.asyncio
+    async def test_get_documents_version(self):
+        """Test the listing fingerprint combines counts and last update."""
+        with patch('agent.db_utils.db_pool') as mock_pool:
+            mock_conn = AsyncMock()
+            mock_conn.fetchrow.return_value = {
+                "document_count": 2,
+                "last_updated": datetime(2024, 1, 1, tzinfo=timezone.utc),
+                "chunk_count": 8
+            }
+            mock_pool.acquire.return_value.__aenter__ = AsyncMock(return_value=mock_conn)
+            mock_pool.acquire.return_value.__aexit__ = AsyncMock(return_value=None)
+            
+            version = await get_documents_version()
+            
+            assert version == "2:2024-01-01T00:00:00+00:00:8"
+            mock_conn.fetchrow.assert_called_once()
 
 
 class TestVectorSearch:
@@ -337,6 +424,39 @@ class TestVectorSearch:
             call_args = mock_conn.fetch.call_args
             assert "match_chunks" in call_args[0][0]
     
+    @pytest.mark.asyncio
+    async def test_vector_search_batch(self):
+        """Test several embeddings are searched in one query."""
+        with patch('agent.db_utils.db_pool') as mock_pool:
+            mock_conn = AsyncMock()
+            row = {
+                "document_id": "doc-1",
+                "content": "Test content",
+                "metadata": '{}',
+                "document_title": "Test Doc",
+                "document_source": "test.md"
+            }
+            mock_conn.fetch.return_value = [
+                {**row, "idx": 1, "chunk_id": "chunk-1", "similarity": 0.9},
+                {**row, "idx": 1, "chunk_id": "chunk-2", "similarity": 0.8},
+                {**row, "idx": 3, "chunk_id": "chunk-3", "similarity": 0.7}
+            ]
+            mock_pool.acquire.return_value.__aenter__ = AsyncMock(return_value=mock_conn)
+            mock_pool.acquire.return_value.__aexit__ = AsyncMock(return_value=None)
+            
+            results = await vector_search_batch([[0.1, 0.2], [0.3, 0.4], [0.5, 0.6]], limit=2)
+            
+            assert [[r["chunk_id"] for r in query_results] for query_results in results] == [
+                ["chunk-1", "chunk-2"],
+                [],
+                ["chunk-3"]
+            ]
+            
+            mock_conn.fetch.assert_called_once()
+            call_args = mock_conn.fetch.call_args
+            assert "LATERAL match_chunks" in call_args[0][0]
+            assert call_args[0][1:] == (["[0.1,0.2]", "[0.3,0.4]", "[0.5,0.6]"], 2)
+    
     @pytest.mark.asyncio
     async def test_hybrid_search(self):
         """Test hybrid search."""
@@ -0,0 +1,94 @@
+"""
+Tests for embedding request batching.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from agent.embedding_batcher import EmbeddingBatcher
+
+
+def fake_embed_batch():
+    """Create a mock provider returning one vector per text."""
+    return AsyncMock(side_effect=lambda texts: [[float(len(text))] for text in texts])
+
+
+class TestEmbeddingBatcher:
+    """Test coalescing of concurrent embedding requests."""
+    
+    @pytest.mark.asyncio
+    async def test_direct_call_before_start(self):
+        """Test embed works without the background worker."""
+        embed_batch = fake_embed_batch()
+        batcher = EmbeddingBatcher(embed_batch)
+        
+        assert await batcher.embed("abc") == [3.0]
+        embed_batch.assert_awaited_once_with(["abc"])
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_batched_and_deduplicated(self):
+        """Test concurrent callers share one provider call."""
+        embed_batch = fake_embed_batch()
+        batcher = EmbeddingBatcher(embed_batch, max_wait=0.05)
+        batcher.start()
+        
+        try:
+            results = await asyncio.gather(
+                batcher.embed("a"),
+                batcher.embed("bb"),
+                batcher.embed("a")
+            )
+        finally:
+            await batcher.stop()
+        
+        assert results == [[1.0], [2.0], [1.0]]
+        embed_batch.assert_awaited_once_with(["a", "bb"])
+    
+    @pytest.mark.asyncio
+    async def test_batch_size_limit(self):
+        """Test batches are split at max_batch_size."""
+        embed_batch = fake_embed_batch()
+        batcher = EmbeddingBatcher(embed_batch, max_batch_size=2, max_wait=0.05)
+        batcher.start()
+        
+        try:
+            await asyncio.gather(*(batcher.embed(text) for text in ("a", "b", "c")))
+        finally:
+            await batcher.stop()
+        
+        assert [call.args[0] for call in embed_batch.await_args_list] == [["a", "b"], ["c"]]
+    
+    @pytest.mark.asyncio
+    async def test_provider_error_propagates(self):
+        """Test a failed batch raises in every waiting caller."""
+        batcher = EmbeddingBatcher(AsyncMock(side_effect=RuntimeError("provider down")))
+        batcher.start()
+        
+        try:
+            results = await asyncio.gather(
+                batcher.embed("a"),
+                batcher.embed("b"),
+                return_exceptions=True
+            )
+        finally:
+            await batcher.stop()
+        
+        assert all(isinstance(result, RuntimeError) for result in results)
+    
+    @pytest.mark.asyncio
+    async def test_stop_during_collection_fails_waiters(self):
+        """Test stopping inside the max_wait window does not strand callers."""
+        embed_batch = fake_embed_batch()
+        batcher = EmbeddingBatcher(embed_batch, max_wait=10)
+        batcher.start()
+        
+        task = asyncio.create_task(batcher.embed("a"))
+        # Let the worker take the request and start waiting for more
+        await asyncio.sleep(0.01)
+        await batcher.stop()
+        
+        with pytest.raises(RuntimeError, match="stopped"):
+            await asyncio.wait_for(task, 1)
+        embed_batch.assert_not_awaited()
@@ -0,0 +1,168 @@
+"""
+Tests for ASGI middleware.
+"""
+
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from agent.middleware import ConditionalGZipMiddleware, FastCORSMiddleware
+
+
+def create_app() -> FastAPI:
+    """Create a small app exercising the middleware."""
+    app = FastAPI()
+    app.add_middleware(ConditionalGZipMiddleware, minimum_size=1000)
+
+    @app.get("/large")
+    async def large():
+        return {"items": ["x" * 50] * 100}
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/events")
+    async def events():
+        async def generate():
+            for i in range(3):
+                yield f"data: {json.dumps({'i': i})}\n\n" * 200
+
+        return StreamingResponse(
+            generate(),
+            headers={"Content-Type": "text/event-stream"}
+        )
+
+    @app.post("/chat/stream")
+    async def excluded():
+        return {"items": ["x" * 50] * 100}
+
+    return app
+
+
+class TestConditionalGZipMiddleware:
+    """Test conditional gzip compression."""
+
+    @pytest.fixture
+    def client(self):
+        return TestClient(create_app())
+
+    def test_large_json_compressed(self, client):
+        """Test large JSON responses are gzipped."""
+        response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json() == {"items": ["x" * 50] * 100}
+
+    def test_small_json_not_compressed(self, client):
+        """Test bodies below the threshold are sent as-is."""
+        response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.json() == {"ok": True}
+
+    def test_event_stream_not_compressed(self, client):
+        """Test SSE responses bypass compression."""
+        response = client.get("/events", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.text.startswith("data: ")
+
+    def test_excluded_path_not_compressed(self, client):
+        """Test excluded paths bypass compression."""
+        response = client.post("/chat/stream", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+
+    def test_no_accept_encoding(self, client):
+        """Test clients without gzip support get plain bodies."""
+        response = client.get("/large", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in response.headers
+        assert len(response.content) == int(response.headers["content-length"])
+
+    def test_compressed_body_is_valid_gzip(self, client):
+        """Test the raw body decompresses with the gzip module."""
+        with client.stream("GET", "/large", headers={"Accept-Encoding": "gzip"}) as response:
+            raw = b"".join(response.iter_raw())
+
+        assert json.loads(gzip.decompress(raw)) == {"items": ["x" * 50] * 100}
+
+
+    def test_vary_merged_with_cors(self):
+        """Test Accept-Encoding joins the Vary: Origin set by CORS."""
+        app = FastAPI()
+        app.add_middleware(FastCORSMiddleware)
+        app.add_middleware(ConditionalGZipMiddleware, minimum_size=1000)
+
+        @app.get("/large")
+        async def large():
+            return {"items": ["x" * 50] * 100}
+
+        response = TestClient(app).get(
+            "/large",
+            headers={"Origin": "http://example.com", "Cookie": "a=b"}
+        )
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers.get_list("vary") == ["Origin, Accept-Encoding"]
+
+
+class TestFastCORSMiddleware:
+    """Test allow-all CORS handling."""
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.add_middleware(FastCORSMiddleware)
+
+        @app.get("/items")
+        async def items():
+            return {"ok": True}
+
+        return TestClient(app)
+
+    def test_no_origin_passthrough(self, client):
+        """Test same-origin requests get no CORS headers."""
+        response = client.get("/items")
+
+        assert response.status_code == 200
+        assert "access-control-allow-origin" not in response.headers
+
+    def test_simple_request(self, client):
+        """Test cross-origin requests are allowed for any origin."""
+        response = client.get("/items", headers={"Origin": "http://example.com"})
+
+        assert response.status_code == 200
+        assert response.headers["access-control-allow-origin"] == "*"
+        assert response.headers["access-control-allow-credentials"] == "true"
+
+    def test_credentialed_request_echoes_origin(self, client):
+        """Test requests with cookies get the explicit origin back."""
+        response = client.get(
+            "/items",
+            headers={"Origin": "http://example.com", "Cookie": "a=b"}
+        )
+
+        assert response.headers["access-control-allow-origin"] == "http://example.com"
+        assert response.headers["vary"] == "Origin"
+
+    def test_preflight_short_circuits(self, client):
+        """Test preflight is answered without hitting routing."""
+        response = client.options(
+            "/not-a-route",
+            headers={
+                "Origin": "http://example.com",
+                "Access-Control-Request-Method": "POST",
+                "Access-Control-Request-Headers": "content-type, authorization"
+            }
+        )
+
+        assert response.status_code == 204
+        assert response.headers["access-control-allow-origin"] == "http://example.com"
+        assert response.headers["access-control-allow-headers"] == "content-type, authorization"
+        assert "POST" in response.headers["access-control-allow-methods"]
@@ -0,0 +1,153 @@
+"""
+Tests for the semantic search cache.
+"""
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+from agent.semantic_cache import GROW_ROWS, SemanticCache, normalize_query
+
+
+class TestNormalizeQuery:
+    """Test query text normalization."""
+    
+    def test_case_and_whitespace(self):
+        """Test case and whitespace differences are folded."""
+        assert normalize_query("  What is\tRAG?\n") == "what is rag?"
+    
+    def test_unicode_compatibility(self):
+        """Test compatibility forms normalize to the same key."""
+        assert normalize_query("ＲＡＧ") == normalize_query("rag")
+
+
+class TestSemanticCache:
+    """Test embedding-keyed result caching."""
+    
+    @pytest.fixture
+    def cache(self):
+        return SemanticCache(threshold=0.95, ttl=60, max_entries=3)
+    
+    def test_exact_hit(self, cache):
+        """Test identical embeddings return cached results."""
+        cache.set([1.0, 0.0, 0.0], 10, ["a", "b"])
+        
+        assert cache.get([1.0, 0.0, 0.0], 10) == ["a", "b"]
+    
+    def test_near_duplicate_hit(self, cache):
+        """Test embeddings above the threshold hit regardless of scale."""
+        cache.set([1.0, 0.0, 0.0], 10, ["a"])
+        
+        assert cache.get([2.0, 0.1, 0.0], 10) == ["a"]
+    
+    def test_dissimilar_miss(self, cache):
+        """Test embeddings below the threshold miss."""
+        cache.set([1.0, 0.0, 0.0], 10, ["a"])
+        
+        assert cache.get([0.0, 1.0, 0.0], 10) is None
+    
+    def test_smaller_limit_sliced(self, cache):
+        """Test a larger cached result set serves smaller limits."""
+        cache.set([1.0, 0.0, 0.0], 3, ["a", "b", "c"])
+        
+        assert cache.get([1.0, 0.0, 0.0], 2) == ["a", "b"]
+        assert cache.get([1.0, 0.0, 0.0], 5) is None
+    
+    def test_expired_entry_removed(self, cache):
+        """Test entries older than the TTL miss and are dropped."""
+        with patch('agent.semantic_cache.time.monotonic', return_value=0.0):
+            cache.set([1.0, 0.0, 0.0], 10, ["a"])
+        
+        with patch('agent.semantic_cache.time.monotonic', return_value=61.0):
+            assert cache.get([1.0, 0.0, 0.0], 10) is None
+        
+        assert len(cache) == 0
+    
+    def test_near_duplicate_replaces_entry(self, cache):
+        """Test storing a near-duplicate refreshes rather than appends."""
+        cache.set([1.0, 0.0, 0.0], 10, ["old"])
+        cache.set([1.0, 0.01, 0.0], 10, ["new"])
+        
+        assert len(cache) == 1
+        assert cache.get([1.0, 0.0, 0.0], 10) == ["new"]
+    
+    def test_lru_eviction(self, cache):
+        """Test the least recently used entry is evicted when full."""
+        now = time.monotonic()
+        with patch('agent.semantic_cache.time.monotonic', side_effect=[now + i for i in range(5)]):
+            cache.set([1.0, 0.0, 0.0], 10, ["x"])
+            cache.set([0.0, 1.0, 0.0], 10, ["y"])
+            cache.set([0.0, 0.0, 1.0], 10, ["z"])
+            cache.get([1.0, 0.0, 0.0], 10)
+            cache.set([1.0, 1.0, 1.0], 10, ["w"])
+        
+        assert len(cache) == 3
+        assert cache.get([0.0, 1.0, 0.0], 10) is None
+        assert cache.get([1.0, 0.0, 0.0], 10) == ["x"]
+    
+    def test_removal_keeps_other_rows_addressable(self, cache):
+        """Test swap-deleting a row leaves the moved entry reachable."""
+        now = time.monotonic()
+        with patch('agent.semantic_cache.time.monotonic', side_effect=[now - 100, now, now, now]):
+            cache.set([1.0, 0.0, 0.0], 10, ["x"])
+            cache.set([0.0, 1.0, 0.0], 10, ["y"])
+            cache.set([0.0, 0.0, 1.0], 10, ["z"])
+            assert cache.get([1.0, 0.0, 0.0], 10) is None
+        
+        assert len(cache) == 2
+        assert cache.get([0.0, 0.0, 1.0], 10) == ["z"]
+        assert cache.get([0.0, 1.0, 0.0], 10) == ["y"]
+    
+    def test_matrix_grows_past_initial_capacity(self):
+        """Test inserts beyond the preallocated rows are kept."""
+        cache = SemanticCache(max_entries=GROW_ROWS + 10)
+        for i in range(GROW_ROWS + 5):
+            embedding = [0.0] * (GROW_ROWS + 5)
+            embedding[i] = 1.0
+            cache.set(embedding, 10, [i])
+        
+        assert len(cache) == GROW_ROWS + 5
+        embedding = [0.0] * (GROW_ROWS + 5)
+        embedding[GROW_ROWS + 4] = 1.0
+        assert cache.get(embedding, 10) == [GROW_ROWS + 4]
+    
+    def test_zero_ttl_disables(self):
+        """Test a zero TTL turns the cache off."""
+        cache = SemanticCache(ttl=0)
+        cache.set([1.0, 0.0], 10, ["a"])
+        
+        assert cache.get([1.0, 0.0], 10) is None
+        assert len(cache) == 0
+    
+    def test_clear(self, cache):
+        """Test clearing removes all entries."""
+        cache.set([1.0, 0.0, 0.0], 10, ["a"])
+        cache.clear()
+        
+        assert cache.get([1.0, 0.0, 0.0], 10) is None
+    
+    def test_text_hit_after_set(self, cache):
+        """Test normalized query text is served without an embedding."""
+        cache.set([1.0, 0.0, 0.0], 10, ["a", "b"], text="What is RAG?")
+        
+        assert cache.get_text("what is  rag?", 10) == ["a", "b"]
+        assert cache.get_text("what is rag?", 20) is None
+        assert cache.get_text("something else", 10) is None
+    
+    def test_embedding_hit_indexes_text(self, cache):
+        """Test a semantic hit registers the new text as an alias."""
+        cache.set([1.0, 0.0, 0.0], 10, ["a"], text="first")
+        
+        assert cache.get([1.0, 0.01, 0.0], 10, text="second") == ["a"]
+        assert cache.get_text("Second", 10) == ["a"]
+    
+    def test_text_dropped_with_entry(self, cache):
+        """Test removed entries no longer answer text lookups."""
+        now = time.monotonic()
+        with patch('agent.semantic_cache.time.monotonic', side_effect=[now - 100, now]):
+            cache.set([1.0, 0.0, 0.0], 10, ["a"], text="query")
+            assert cache.get_text("query", 10) is None
+        
+        assert cache.get_text("query", 10) is None
+        assert len(cache) == 0
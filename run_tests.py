@@ -4,14 +4,26 @@ Test Runner - Easy access to all test suites
 Provides convenient interface to run individual test suites or master validation
 """
 
-import subprocess
+import asyncio
+import importlib
+import inspect
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+TESTS_DIR = Path(__file__).parent / "tests"
+
+def _load_suite(test_name: str):
+    """Import a test suite module (cached by the import system after the first load)."""
+    # Suites import their helpers (e.g. test_config) as top-level modules
+    if str(TESTS_DIR) not in sys.path:
+        sys.path.insert(0, str(TESTS_DIR))
+    return importlib.import_module(f"test_{test_name}")
+
 def run_test_suite(test_name: str) -> int:
-    """Run a specific test suite and return exit code."""
-    test_file = Path(__file__).parent / "tests" / f"test_{test_name}.py"
+    """Run a specific test suite in-process and return exit code."""
+    test_file = TESTS_DIR / f"test_{test_name}.py"
     
     if not test_file.exists():
         print(f"❌ Test file not found: {test_file}")
@@ -21,11 +33,15 @@ def run_test_suite(test_name: str) -> int:
     print("-" * 50)
     
     try:
-        result = subprocess.run([
-            sys.executable, str(test_file)
-        ], cwd=str(Path(__file__).parent))
-        
-        return result.returncode
+        result = _load_suite(test_name).main()
+        if inspect.iscoroutine(result):
+            asyncio.run(result)
+        return 0
+    except SystemExit as e:
+        # Suites report their result through sys.exit()
+        if e.code is None:
+            return 0
+        return e.code if isinstance(e.code, int) else 1
     except Exception as e:
         print(f"❌ Failed to run test: {e}")
         return 1
@@ -56,11 +72,10 @@ def run_all_individual_suites() -> None:
     print("🧪 Running All Individual Test Suites")
     print("=" * 50)
     
-    results = {}
-    for suite in suites:
-        print(f"\n{'='*20} {suite.upper().replace('_', ' ')} {'='*20}")
-        exit_code = run_test_suite(suite)
-        results[suite] = exit_code == 0
+    # Suites are I/O-bound against the running stack, so run them side by side
+    with ThreadPoolExecutor(max_workers=len(suites)) as executor:
+        exit_codes = executor.map(run_test_suite, suites)
+        results = {suite: exit_code == 0 for suite, exit_code in zip(suites, exit_codes)}
     
     print("\n" + "=" * 50)
     print("📊 INDIVIDUAL SUITES SUMMARY")
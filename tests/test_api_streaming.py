@@ -6,33 +6,110 @@ Replaces: test_phase32.py with expanded functionality
 """
 
 import asyncio
-import json
+import re
 import time
-import aiohttp
+import httpx
+import orjson
 import subprocess
 import sys
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+
+try:
+    import uvloop
+except ImportError:  # Optional, falls back to the default asyncio loop
+    uvloop = None
 
 # Import test configuration
 from test_config import TestConfig
 
+# Request bodies are pre-encoded with orjson and sent as raw content
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# SSE framing, compared against raw response bytes
+SSE_PREFIX = b"data: "
+SSE_DONE = b"[DONE]"
+SSE_DONE_FRAME = SSE_PREFIX + SSE_DONE
+
+# Object type of every OpenAI streaming chunk
+CHUNK_OBJECT = "chat.completion.chunk"
+
+KONG_PATTERN = re.compile(rb"kong", re.IGNORECASE)
+
+# Upper bound on tests running at once, so the agent is not flooded
+MAX_CONCURRENT_TESTS = 8
+
 
 class ApiStreamingTests:
     """Test suite for API endpoints, streaming, and service communication."""
     
+    __slots__ = ("config", "base_url", "results", "client", "_docker_ps_cache")
+    
     def __init__(self):
         self.config = TestConfig()
         self.base_url = self.config.base_url
         self.results = {}
+        self.client = None
+        # Container names from `docker ps`, fetched once per run
+        self._docker_ps_cache: Optional[bytes] = None
         
         # Auto-detect models at startup
         print(f"🔧 Using model: {self.config.primary_model}")
         
+    async def setup(self):
+        """Open the HTTP client shared by all tests."""
+        limits = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+        
+        # Route agent requests over its Unix socket when configured; other hosts stay on TCP
+        mounts = None
+        if self.config.uds_path:
+            mounts = {self.base_url: httpx.AsyncHTTPTransport(uds=self.config.uds_path, limits=limits)}
+        
+        # Responses travel over loopback, so skip compressing and decompressing them
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={"Accept-Encoding": "identity"},
+            http2=self.config.http2,
+            limits=limits,
+            mounts=mounts,
+            timeout=self.config.timeout
+        )
+    
     async def run_all_tests(self):
         """Run all API and streaming tests."""
         print("🧪 Starting API & Streaming Test Suite...")
         print("=" * 60)
         
+        await self.setup()
+        try:
+            if not await self._wait_ready():
+                print("⚠️  Agent not ready, running tests anyway")
+            await self._run_tests()
+        finally:
+            await self.client.aclose()
+        
+        self.print_summary()
+    
+    async def _wait_ready(self, timeout: float = 10.0) -> bool:
+        """Poll /health with exponential backoff until the agent answers 200."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        delay = 0.05
+        
+        while True:
+            try:
+                response = await self.client.get("/health", timeout=1.0)
+                if response.status_code == 200:
+                    return True
+            except httpx.TransportError:
+                pass
+            
+            if loop.time() + delay > deadline:
+                return False
+            await asyncio.sleep(delay)
+            delay *= 2
+    
+    async def _run_tests(self):
+        """Run each test and record its result."""
         # Core API tests (from original test_phase32.py)
         core_tests = [
             ("Model Discovery", self.test_models_endpoint),
@@ -54,74 +131,120 @@ class ApiStreamingTests:
         
         tests = core_tests + communication_tests
         
+        # Latency is measured on an otherwise idle server and session persistence
+        # depends on server-side conversation state, so both run on their own
+        concurrent_tests = [
+            (test_name, test_func) for test_name, test_func in tests
+            if test_name not in ("First Token Latency", "Session Persistence")
+        ]
+        
         print(f"\n📋 Running {len(tests)} comprehensive API and streaming tests...")
         
-        for test_name, test_func in tests:
+        outcomes = {"First Token Latency": await self._capture(self.test_streaming_latency)}
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_TESTS)
+        concurrent_outcomes = await asyncio.gather(
+            *(self._capture(test_func, semaphore) for _, test_func in concurrent_tests)
+        )
+        outcomes.update(zip((test_name for test_name, _ in concurrent_tests), concurrent_outcomes))
+        outcomes["Session Persistence"] = await self._capture(self.test_session_persistence)
+        
+        for test_name, _ in tests:
             print(f"\n🔍 {test_name}")
-            try:
-                result = await test_func()
-                self.results[test_name] = result
-                status = "✅ PASS" if result["success"] else "❌ FAIL"
-                print(f"   {status}: {result['message']}")
-                if not result["success"] and "details" in result:
-                    print(f"   Details: {result['details']}")
-            except Exception as e:
-                self.results[test_name] = {"success": False, "message": str(e)}
-                print(f"   ❌ ERROR: {str(e)}")
+            result = outcomes[test_name]
+            if isinstance(result, Exception):
+                self.results[test_name] = {"success": False, "message": str(result)}
+                print(f"   ❌ ERROR: {str(result)}")
+                continue
+            
+            self.results[test_name] = result
+            status = "✅ PASS" if result["success"] else "❌ FAIL"
+            print(f"   {status}: {result['message']}")
+            if not result["success"] and "details" in result:
+                print(f"   Details: {result['details']}")
+    
+    async def _capture(self, test_func, semaphore: Optional[asyncio.Semaphore] = None):
+        """Await a test, returning any exception instead of raising it."""
+        try:
+            if semaphore is None:
+                return await test_func()
+            async with semaphore:
+                return await test_func()
+        except Exception as e:
+            return e
+    
+    async def _iter_sse_lines(self, response: httpx.Response):
+        """Yield raw SSE lines as bytes, splitting each network read once."""
+        buffer = bytearray()
+        async for chunk in response.aiter_bytes():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            
+            # Validate every complete line from this read without awaiting
+            for line in lines:
+                yield line.rstrip(b"\r")
         
-        self.print_summary()
+        if buffer:
+            yield buffer
     
     async def test_models_endpoint(self) -> Dict[str, Any]:
         """T1: Test /v1/models endpoint returns expected models."""
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.base_url}/v1/models") as response:
-                if response.status != 200:
-                    return {"success": False, "message": f"Status {response.status}"}
-                
-                data = await response.json()
-                
-                # Validate structure
-                if "data" not in data:
-                    return {"success": False, "message": "Missing 'data' field"}
-                
-                models = [model["id"] for model in data["data"]]
-                
-                # Check if primary model is available
-                primary_model = self.config.primary_model
-                if primary_model not in models:
-                    return {"success": False, "message": f"Primary model '{primary_model}' not found in {models}"}
-                
-                return {"success": True, "message": f"Found models: {models}, using: {primary_model}"}
+        response = await self.client.get("/v1/models")
+        if response.status_code != 200:
+            return {"success": False, "message": f"Status {response.status_code}"}
+        
+        data = orjson.loads(response.content)
+        
+        # Validate structure
+        if "data" not in data:
+            return {"success": False, "message": "Missing 'data' field"}
+        
+        models = [model["id"] for model in data["data"]]
+        
+        # Check if primary model is available
+        primary_model = self.config.primary_model
+        if primary_model not in models:
+            return {"success": False, "message": f"Primary model '{primary_model}' not found in {models}"}
+        
+        return {"success": True, "message": f"Found models: {models}, using: {primary_model}"}
     
     async def test_streaming_latency(self) -> Dict[str, Any]:
         """T2: Test first token latency meets threshold on streaming request."""
         message = self.config.get_test_message_simple()
-        payload = self.config.create_chat_payload(message, stream=True)
+        # Only the first token is timed, so bound generation to keep the run short
+        bounded = {"max_tokens": 1, "temperature": 0.0}
+        payload = {**self.config.create_chat_payload(message, stream=True), **bounded}
+        warmup_payload = {**self.config.create_chat_payload(message, stream=False), **bounded}
         
-        start_time = time.time()
+        # Warm up the server so cold-start cost is not counted as first-token latency
+        await self.client.post(
+            "/v1/chat/completions",
+            content=orjson.dumps(warmup_payload),
+            headers=JSON_HEADERS
+        )
+        
+        start_time = time.perf_counter()
         first_token_time = None
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{self.base_url}/v1/chat/completions", 
-                json=payload,
-                headers={"Content-Type": "application/json"}
-            ) as response:
-                if response.status != 200:
-                    return {"success": False, "message": f"Status {response.status}"}
-                
-                async for line in response.content:
-                    line_str = line.decode().strip()
-                    if line_str.startswith("data: ") and not line_str.endswith("[DONE]"):
-                        if first_token_time is None:
-                            first_token_time = time.time()
-                            break
+        async with self.client.stream(
+            "POST",
+            "/v1/chat/completions",
+            content=orjson.dumps(payload),
+            headers=JSON_HEADERS
+        ) as response:
+            if response.status_code != 200:
+                return {"success": False, "message": f"Status {response.status_code}"}
+            
+            # The first data frame marks the first token, so no line framing is needed
+            async for chunk in response.aiter_bytes():
+                if SSE_PREFIX in chunk and not chunk.lstrip().startswith(SSE_DONE_FRAME):
+                    first_token_time = time.perf_counter()
+                    break
         
         if first_token_time is None:
             return {"success": False, "message": "No tokens received"}
         
         latency = first_token_time - start_time
-        threshold = self.config.get_performance_thresholds()["first_token_latency"]
+        threshold = self.config.performance_thresholds["first_token_latency"]
         success = latency < threshold
         
         return {
@@ -139,24 +262,33 @@ class ApiStreamingTests:
         
         session_id = None
         responses = []
+        request_times_ms = []
         
-        async with aiohttp.ClientSession() as session:
-            for i, message in enumerate(messages):
-                payload = {
-                    "model": self.config.primary_model, 
-                    "messages": messages[:i+1],  # Include conversation history
-                    "stream": False
-                }
-                
-                async with session.post(
-                    f"{self.base_url}/v1/chat/completions",
-                    json=payload
-                ) as response:
-                    if response.status != 200:
-                        return {"success": False, "message": f"Message {i+1} failed: {response.status}"}
-                    
-                    data = await response.json()
-                    responses.append(data)
+        # Encode every turn up front so only the requests sit between the two sends
+        bodies = []
+        conversation = []
+        for message in messages:
+            conversation.append(message)
+            # Each body snapshots the conversation history so far
+            bodies.append(orjson.dumps({
+                "model": self.config.primary_model, 
+                "messages": conversation,
+                "stream": False
+            }))
+        
+        for i, body in enumerate(bodies):
+            request_start = time.perf_counter()
+            response = await self.client.post(
+                "/v1/chat/completions",
+                content=body,
+                headers=JSON_HEADERS
+            )
+            request_times_ms.append((time.perf_counter() - request_start) * 1000)
+            if response.status_code != 200:
+                return {"success": False, "message": f"Message {i+1} failed: {response.status_code}"}
+            
+            data = orjson.loads(response.content)
+            responses.append(data)
         
         # Check if we get coherent responses (basic validation)
         if len(responses) != 2:
@@ -165,31 +297,45 @@ class ApiStreamingTests:
         return {
             "success": True,
             "message": f"Session persistence test completed with {len(responses)} messages",
-            "responses": [r["choices"][0]["message"]["content"][:50] + "..." for r in responses]
+            "responses": [r["choices"][0]["message"]["content"][:50] + "..." for r in responses],
+            "request_times_ms": request_times_ms
         }
     
+    async def _docker_ps(self) -> bytes:
+        """Return `docker ps` container names, running docker only once per run."""
+        if self._docker_ps_cache is None:
+            # Run docker without blocking the tests sharing the event loop
+            process = await asyncio.create_subprocess_exec(
+                "docker", "ps", "--format", "{{.Names}}",
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            stdout, stderr = await process.communicate()
+            if process.returncode != 0:
+                raise subprocess.CalledProcessError(process.returncode, "docker ps", stdout, stderr)
+            
+            self._docker_ps_cache = stdout
+        
+        return self._docker_ps_cache
+    
     async def test_no_kong_containers(self) -> Dict[str, Any]:
         """T4: Test that no Kong containers are running."""
         try:
-            result = subprocess.run(
-                ["docker", "ps", "--format", "{{.Names}}"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
+            output = await self._docker_ps()
             
-            container_names = result.stdout.strip().split('\n')
-            kong_containers = [name for name in container_names if 'kong' in name.lower()]
-            
-            if kong_containers:
+            # Scan the raw output once; names are only split out to report a match
+            if not KONG_PATTERN.search(output):
                 return {
-                    "success": False,
-                    "message": f"Found Kong containers: {kong_containers}"
+                    "success": True,
+                    "message": "No Kong containers found"
                 }
             
+            kong_containers = [
+                name.decode() for name in output.splitlines() if KONG_PATTERN.search(name)
+            ]
             return {
-                "success": True,
-                "message": "No Kong containers found"
+                "success": False,
+                "message": f"Found Kong containers: {kong_containers}"
             }
             
         except subprocess.CalledProcessError as e:
@@ -197,51 +343,50 @@ class ApiStreamingTests:
     
     async def test_health_endpoint(self) -> Dict[str, Any]:
         """T5: Test health endpoint returns 200 OK."""
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.base_url}/health") as response:
-                if response.status != 200:
-                    return {"success": False, "message": f"Status {response.status}"}
-                
-                data = await response.json()
-                status = data.get("status", "unknown")
-                
-                return {
-                    "success": True,
-                    "message": f"Health check OK, status: {status}",
-                    "health_data": data
-                }
+        response = await self.client.get("/health")
+        if response.status_code != 200:
+            return {"success": False, "message": f"Status {response.status_code}"}
+        
+        data = orjson.loads(response.content)
+        status = data.get("status", "unknown")
+        
+        return {
+            "success": True,
+            "message": f"Health check OK, status: {status}",
+            "health_data": data
+        }
     
     async def test_chat_completions(self) -> Dict[str, Any]:
         """T6: Test basic OpenAI chat completions functionality."""
         payload = self.config.create_chat_payload("What is 2+2?", stream=False)
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{self.base_url}/v1/chat/completions",
-                json=payload
-            ) as response:
-                if response.status != 200:
-                    return {"success": False, "message": f"Status {response.status}"}
-                
-                data = await response.json()
-                
-                # Validate OpenAI response structure
-                required_fields = ["id", "object", "created", "model", "choices"]
-                missing_fields = [field for field in required_fields if field not in data]
-                
-                if missing_fields:
-                    return {"success": False, "message": f"Missing fields: {missing_fields}"}
-                
-                if not data["choices"] or "message" not in data["choices"][0]:
-                    return {"success": False, "message": "Invalid choices structure"}
-                
-                response_text = data["choices"][0]["message"]["content"]
-                
-                return {
-                    "success": True,
-                    "message": f"Chat completion successful",
-                    "response_preview": response_text[:100] + "..." if len(response_text) > 100 else response_text
-                }
+        response = await self.client.post(
+            "/v1/chat/completions",
+            content=orjson.dumps(payload),
+            headers=JSON_HEADERS
+        )
+        if response.status_code != 200:
+            return {"success": False, "message": f"Status {response.status_code}"}
+        
+        data = orjson.loads(response.content)
+        
+        # Validate OpenAI response structure
+        required_fields = ["id", "object", "created", "model", "choices"]
+        missing_fields = [field for field in required_fields if field not in data]
+        
+        if missing_fields:
+            return {"success": False, "message": f"Missing fields: {missing_fields}"}
+        
+        if not data["choices"] or "message" not in data["choices"][0]:
+            return {"success": False, "message": "Invalid choices structure"}
+        
+        response_text = data["choices"][0]["message"]["content"]
+        
+        return {
+            "success": True,
+            "message": f"Chat completion successful",
+            "response_preview": response_text[:100] + "..." if len(response_text) > 100 else response_text
+        }
     
     async def test_streaming_format(self) -> Dict[str, Any]:
         """T7: Test OpenAI-compatible streaming format."""
@@ -252,42 +397,42 @@ class ApiStreamingTests:
         valid_format = True
         error_details = []
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{self.base_url}/v1/chat/completions",
-                json=payload
-            ) as response:
-                if response.status != 200:
-                    return {"success": False, "message": f"Status {response.status}"}
-                
-                async for line in response.content:
-                    line_str = line.decode().strip()
-                    if line_str.startswith("data: "):
-                        chunks_received += 1
-                        data_str = line_str[6:]  # Remove "data: " prefix
+        async with self.client.stream(
+            "POST",
+            "/v1/chat/completions",
+            content=orjson.dumps(payload),
+            headers=JSON_HEADERS
+        ) as response:
+            if response.status_code != 200:
+                return {"success": False, "message": f"Status {response.status_code}"}
+            
+            async for line in self._iter_sse_lines(response):
+                if line.startswith(SSE_PREFIX):
+                    chunks_received += 1
+                    data = memoryview(line)[len(SSE_PREFIX):]  # Strip the prefix without copying
+                    
+                    if data == SSE_DONE:
+                        break
+                    
+                    try:
+                        chunk_data = orjson.loads(data)
                         
-                        if data_str == "[DONE]":
-                            break
+                        # Validate chunk structure
+                        if chunk_data.get("object") != CHUNK_OBJECT:
+                            valid_format = False
+                            error_details.append(f"Invalid object type: {chunk_data.get('object')}")
                         
-                        try:
-                            chunk_data = json.loads(data_str)
-                            
-                            # Validate chunk structure
-                            if "object" not in chunk_data or chunk_data["object"] != "chat.completion.chunk":
-                                valid_format = False
-                                error_details.append(f"Invalid object type: {chunk_data.get('object')}")
-                            
-                            if "choices" not in chunk_data or not chunk_data["choices"]:
-                                valid_format = False
-                                error_details.append("Missing or empty choices")
-                            
-                        except json.JSONDecodeError as e:
+                        if "choices" not in chunk_data or not chunk_data["choices"]:
                             valid_format = False
-                            error_details.append(f"JSON decode error: {e}")
+                            error_details.append("Missing or empty choices")
                         
-                        # Stop after checking a few chunks
-                        if chunks_received >= 3:
-                            break
+                    except orjson.JSONDecodeError as e:
+                        valid_format = False
+                        error_details.append(f"JSON decode error: {e}")
+                    
+                    # Stop after checking a few chunks
+                    if chunks_received >= 3:
+                        break
         
         if chunks_received == 0:
             return {"success": False, "message": "No chunks received"}
@@ -307,17 +452,16 @@ class ApiStreamingTests:
     async def test_inter_service_networking(self) -> Dict[str, Any]:
         """Test inter-service communication and networking."""
         try:
-            async with aiohttp.ClientSession() as session:
-                # Test OpenWebUI can reach Agent
-                async with session.get(f"{self.base_url}/health") as response:
-                    if response.status != 200:
-                        return {"success": False, "message": f"Agent not reachable: {response.status}"}
-                
-                # Test agent API is working (if API works, networking is functional)
-                # This is more reliable than using nc which may not be available
-                async with session.get(f"{self.base_url}/v1/models") as models_response:
-                    if models_response.status != 200:
-                        return {"success": False, "message": "Agent API not functional"}
+            # Test OpenWebUI can reach Agent
+            response = await self.client.get("/health")
+            if response.status_code != 200:
+                return {"success": False, "message": f"Agent not reachable: {response.status_code}"}
+            
+            # Test agent API is working (if API works, networking is functional)
+            # This is more reliable than using nc which may not be available
+            models_response = await self.client.get("/v1/models")
+            if models_response.status_code != 200:
+                return {"success": False, "message": "Agent API not functional"}
             
             return {"success": True, "message": "Inter-service networking functional"}
             
@@ -328,15 +472,14 @@ class ApiStreamingTests:
         """Test Caddy proxy routing and WebSocket connections."""
         try:
             # Test direct OpenWebUI access via proxy
-            async with aiohttp.ClientSession() as session:
-                async with session.get("http://localhost:8002") as response:
-                    if response.status not in [200, 302]:  # Allow redirects
-                        return {"success": False, "message": f"Proxy routing failed: {response.status}"}
-                
-                # Test agent API access via proxy/direct
-                async with session.get(f"{self.base_url}/v1/models") as response:
-                    if response.status != 200:
-                        return {"success": False, "message": f"API routing failed: {response.status}"}
+            response = await self.client.get(self.config.openwebui_url)
+            if response.status_code not in [200, 302]:  # Allow redirects
+                return {"success": False, "message": f"Proxy routing failed: {response.status_code}"}
+            
+            # Test agent API access via proxy/direct
+            response = await self.client.get("/v1/models")
+            if response.status_code != 200:
+                return {"success": False, "message": f"API routing failed: {response.status_code}"}
             
             return {"success": True, "message": "Proxy routing working correctly"}
             
@@ -353,23 +496,24 @@ class ApiStreamingTests:
                 "stream": False
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.base_url}/v1/chat/completions",
-                    json=payload
-                ) as response:
-                    # Should handle gracefully - either 400 or fallback to default model
-                    if response.status not in [200, 400, 422]:
-                        return {"success": False, "message": f"Unexpected error handling: {response.status}"}
-                
-                # Test malformed request
-                malformed_payload = {"invalid": "request"}
-                async with session.post(
-                    f"{self.base_url}/v1/chat/completions",
-                    json=malformed_payload
-                ) as response:
-                    if response.status not in [400, 422]:  # Should return validation error
-                        return {"success": False, "message": f"Poor error handling for malformed request: {response.status}"}
+            response = await self.client.post(
+                "/v1/chat/completions",
+                content=orjson.dumps(payload),
+                headers=JSON_HEADERS
+            )
+            # Should handle gracefully - either 400 or fallback to default model
+            if response.status_code not in [200, 400, 422]:
+                return {"success": False, "message": f"Unexpected error handling: {response.status_code}"}
+            
+            # Test malformed request
+            malformed_payload = {"invalid": "request"}
+            response = await self.client.post(
+                "/v1/chat/completions",
+                content=orjson.dumps(malformed_payload),
+                headers=JSON_HEADERS
+            )
+            if response.status_code not in [400, 422]:  # Should return validation error
+                return {"success": False, "message": f"Poor error handling for malformed request: {response.status_code}"}
             
             return {"success": True, "message": "API error recovery working"}
             
@@ -382,35 +526,36 @@ class ApiStreamingTests:
             # Test non-streaming request
             non_stream_payload = self.config.create_chat_payload("short response", stream=False)
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.base_url}/v1/chat/completions",
-                    json=non_stream_payload
-                ) as response:
-                    if response.status != 200:
-                        return {"success": False, "message": f"Non-streaming failed: {response.status}"}
-                    
-                    data = await response.json()
-                    if "choices" not in data:
-                        return {"success": False, "message": "Non-streaming response malformed"}
-                
-                # Test streaming request immediately after
-                stream_payload = self.config.create_chat_payload("stream this", stream=True)
+            response = await self.client.post(
+                "/v1/chat/completions",
+                content=orjson.dumps(non_stream_payload),
+                headers=JSON_HEADERS
+            )
+            if response.status_code != 200:
+                return {"success": False, "message": f"Non-streaming failed: {response.status_code}"}
+            
+            data = orjson.loads(response.content)
+            if "choices" not in data:
+                return {"success": False, "message": "Non-streaming response malformed"}
+            
+            # Test streaming request immediately after
+            stream_payload = self.config.create_chat_payload("stream this", stream=True)
+            
+            chunks_received = 0
+            async with self.client.stream(
+                "POST",
+                "/v1/chat/completions",
+                content=orjson.dumps(stream_payload),
+                headers=JSON_HEADERS
+            ) as response:
+                if response.status_code != 200:
+                    return {"success": False, "message": f"Streaming switch failed: {response.status_code}"}
                 
-                chunks_received = 0
-                async with session.post(
-                    f"{self.base_url}/v1/chat/completions",
-                    json=stream_payload
-                ) as response:
-                    if response.status != 200:
-                        return {"success": False, "message": f"Streaming switch failed: {response.status}"}
-                    
-                    async for line in response.content:
-                        line_str = line.decode().strip()
-                        if line_str.startswith("data: "):
-                            chunks_received += 1
-                            if chunks_received >= 2:  # Got some chunks
-                                break
+                async for line in self._iter_sse_lines(response):
+                    if line.startswith(SSE_PREFIX):
+                        chunks_received += 1
+                        if chunks_received >= 2:  # Got some chunks
+                            break
             
             if chunks_received == 0:
                 return {"success": False, "message": "No streaming chunks received"}
@@ -465,6 +610,10 @@ async def main():
         print("- Connection state management")
         return
     
+    # Let tasks that finish without suspending skip a loop iteration (Python 3.12+)
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    
     tester = ApiStreamingTests()
     await tester.run_all_tests()
     
@@ -481,4 +630,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
\ No newline at end of file
@@ -5,36 +5,64 @@ Makes tests more robust and maintainable by avoiding hard-coded values
 """
 
 import os
-import json
-import aiohttp
-import requests
-from typing import Dict, List, Optional, Any
+import threading
+import time
+import orjson
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+from urllib.request import urlopen
 
 # Load environment variables from .env.test if available
 def load_test_env():
     """Load test environment variables from .env.test file if it exists."""
-    env_file = os.path.join(os.path.dirname(__file__), '..', '.env.test.local')
-    if not os.path.exists(env_file):
-        env_file = os.path.join(os.path.dirname(__file__), '..', '.env.test')
-    
-    if os.path.exists(env_file):
-        with open(env_file, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    if value and key not in os.environ:  # Don't override existing env vars
-                        os.environ[key] = value
+    project_root = Path(__file__).parent.parent
+    for env_file in (project_root / '.env.test.local', project_root / '.env.test'):
+        try:
+            text = env_file.read_text()
+            break
+        except FileNotFoundError:
+            continue
+    else:
+        return
+    
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        
+        key, separator, value = line.partition('=')
+        if separator and value and key not in os.environ:  # Don't override existing env vars
+            os.environ[key] = value
 
 load_test_env()
 
 class TestConfig:
     """Centralized configuration for all test suites."""
     
+    # Models detected per base URL, shared by every instance so suites in one
+    # run query /v1/models once: base_url -> (detected_at, models)
+    _detected_models: Dict[str, Tuple[float, List[str]]] = {}
+    _detect_lock = threading.Lock()
+    DETECTION_TTL = 300.0
+    
     def __init__(self):
         self.base_url = os.getenv("AGENT_BASE_URL", "http://localhost:8009")
         self.openwebui_url = os.getenv("OPENWEBUI_URL", "http://localhost:8002")
+        # Neo4j's published HTTP API, queried directly instead of via docker exec
+        self.neo4j_url = os.getenv("NEO4J_HTTP_URL", "http://localhost:7474")
+        self.neo4j_auth = (os.getenv("NEO4J_USER", "neo4j"), os.getenv("NEO4J_PASSWORD", "password"))
         self.timeout = int(os.getenv("TEST_TIMEOUT", "30"))
+        # Optional Unix socket the agent listens on (uvicorn --uds), skips TCP
+        self.uds_path = os.getenv("AGENT_UDS_PATH")
+        # HTTP/2 needs an h2-capable endpoint (e.g. Caddy over TLS) and httpx[http2]
+        self.http2 = os.getenv("TEST_HTTP2", "false").lower() == "true"
+        
+        # Performance thresholds, read from the environment once
+        self.performance_thresholds = {
+            "first_token_latency": float(os.getenv("FIRST_TOKEN_THRESHOLD", "2.0")),
+            "full_response_timeout": float(os.getenv("FULL_RESPONSE_THRESHOLD", "30.0")),
+            "health_check_timeout": float(os.getenv("HEALTH_CHECK_THRESHOLD", "5.0"))
+        }
         
         # Model configuration
         self.preferred_model = os.getenv("PREFERRED_MODEL", "")  # Empty means auto-detect
@@ -68,40 +96,62 @@ class TestConfig:
             print(f"🔧 Using configured model: {self._primary_model}")
             return
         
-        # Try to detect from API
-        try:
-            response = requests.get(f"{self.base_url}/v1/models", timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if "data" in data and data["data"]:
-                    self._available_models = [model["id"] for model in data["data"]]
-                    
-                    # Use preferred model if available, otherwise first detected
-                    if self.preferred_model and self.preferred_model in self._available_models:
-                        self._primary_model = self.preferred_model
-                        print(f"🎯 Using preferred model: {self._primary_model}")
-                    else:
-                        self._primary_model = self._available_models[0]
-                        print(f"🔍 Auto-detected models: {self._available_models}")
-                        print(f"📌 Using primary model: {self._primary_model}")
-                    return
-        except Exception as e:
-            print(f"⚠️  Model detection failed: {e}")
+        # Reuse a recent detection from any instance, otherwise ask the API
+        with self._detect_lock:
+            models = self._cached_models()
+            if models is None:
+                try:
+                    # urllib keeps the heavier HTTP client imports off the suites' startup path
+                    with urlopen(f"{self.base_url}/v1/models", timeout=10) as response:
+                        data = orjson.loads(response.read())
+                    if "data" in data and data["data"]:
+                        models = [model["id"] for model in data["data"]]
+                        self._store_models(models)
+                except Exception as e:
+                    print(f"⚠️  Model detection failed: {e}")
+        
+        if models:
+            self._available_models = models
+            
+            # Use preferred model if available, otherwise first detected
+            if self.preferred_model and self.preferred_model in self._available_models:
+                self._primary_model = self.preferred_model
+                print(f"🎯 Using preferred model: {self._primary_model}")
+            else:
+                self._primary_model = self._available_models[0]
+                print(f"🔍 Auto-detected models: {self._available_models}")
+                print(f"📌 Using primary model: {self._primary_model}")
+            return
         
         # Fallback values
         self._available_models = [self.fallback_model]
         self._primary_model = self.fallback_model
         print(f"⚠️  Using fallback model: {self._primary_model}")
     
+    def _cached_models(self) -> Optional[List[str]]:
+        """Return models detected for this base URL within the TTL, if any."""
+        cached = self._detected_models.get(self.base_url)
+        if cached and time.monotonic() - cached[0] < self.DETECTION_TTL:
+            return cached[1]
+        return None
+    
+    def _store_models(self, models: List[str]):
+        """Remember detected models for every instance using this base URL."""
+        self._detected_models[self.base_url] = (time.monotonic(), models)
+    
     async def detect_models_async(self) -> List[str]:
         """Async version of model detection for use in async test contexts."""
+        # Imported here so suites that only use sync detection don't load aiohttp
+        import aiohttp
+        
         try:
             async with aiohttp.ClientSession() as session:
                 async with session.get(f"{self.base_url}/v1/models") as response:
                     if response.status == 200:
-                        data = await response.json()
+                        data = orjson.loads(await response.read())
                         if "data" in data and data["data"]:
                             models = [model["id"] for model in data["data"]]
+                            self._store_models(models)
                             self._available_models = models
                             self._primary_model = models[0]
                             return models
@@ -135,11 +185,7 @@ class TestConfig:
     
     def get_performance_thresholds(self) -> Dict[str, float]:
         """Get performance thresholds for various operations."""
-        return {
-            "first_token_latency": float(os.getenv("FIRST_TOKEN_THRESHOLD", "2.0")),
-            "full_response_timeout": float(os.getenv("FULL_RESPONSE_THRESHOLD", "30.0")),
-            "health_check_timeout": float(os.getenv("HEALTH_CHECK_THRESHOLD", "5.0"))
-        }
+        return self.performance_thresholds
     
     def create_chat_payload(self, message: str, stream: bool = False, model: Optional[str] = None) -> Dict[str, Any]:
         """Create a standardized chat completion payload."""
@@ -166,6 +212,10 @@ class TestConfig:
         print(f"  Primary Model: {self.primary_model}")
         print(f"  Available Models: {self.available_models}")
         print(f"  Timeout: {self.timeout}s")
+        if self.uds_path:
+            print(f"  Agent Socket: {self.uds_path}")
+        if self.http2:
+            print("  HTTP/2: enabled")
         thresholds = self.get_performance_thresholds()
         print(f"  Latency Threshold: {thresholds['first_token_latency']}s")
 
@@ -201,4 +251,4 @@ if __name__ == "__main__":
     
     # Test payload creation
     payload = config.create_chat_payload("test message", stream=True)
-    print(f"\n📝 Sample payload: {json.dumps(payload, indent=2)}")
\ No newline at end of file
+    print(f"\n📝 Sample payload: {orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode()}")
\ No newline at end of file
@@ -12,13 +12,133 @@ This master suite:
 """
 
 import subprocess
-import json
+import hashlib
+import re
 import time
 import sys
 import os
+import shutil
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
+from xml.sax.saxutils import XMLGenerator
+
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+
+# Suites run side by side; leave two cores for the services under test
+MAX_PARALLEL_SUITES = max(1, (os.cpu_count() or 1) - 2)
+
+# Suites that run alone, before the others start: API & Streaming measures
+# first-token latency against the shared LLM backend, so it must not compete
+# with the chat requests made by the other suites
+EXCLUSIVE_SUITES = {"API & Streaming"}
+
+# Report dividers, built once
+RULE = "=" * 70
+SECTION_BANNER = f"\n{'=' * 20} {{}} {'=' * 20}"
+
+# Per-suite input fingerprints, outcomes and timings from the last run
+MANIFEST_FILE = Path.home() / ".local-rag" / "test_manifest.json"
+
+# Inputs every suite depends on, relative to the repository root
+SHARED_INPUTS = [
+    "agentic-rag-knowledge-graph/**/*.py",
+    "local-ai-packaged/docker-compose*.yml",
+    "tests/test_config.py"
+]
+
+# Trailing lines of each suite's stdout/stderr kept for the report
+OUTPUT_TAIL_LINES = 2000
+
+# Control characters XML 1.0 cannot carry (e.g. ANSI escapes in suite output)
+XML_INVALID = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+def _detect_compose(docker: str) -> List[str]:
+    """Prefer the Compose v2 plugin, falling back to standalone docker-compose."""
+    try:
+        result = subprocess.run([docker, "compose", "version"], capture_output=True, timeout=10)
+        if result.returncode == 0:
+            return [docker, "compose"]
+    except (OSError, subprocess.TimeoutExpired):
+        pass
+    return [shutil.which("docker-compose") or "docker-compose"]
+
+def _hash_stat(digest, path: Path, root: Path) -> None:
+    """Feed a file's path, size and modification time into a digest."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return
+    digest.update(f"{path.relative_to(root)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+
+def _pump(stream, tail: deque) -> None:
+    """Drain a child process stream, keeping only its last lines."""
+    with stream:
+        for line in stream:
+            tail.append(line)
+
+class JUnitWriter:
+    """Stream finished suites to a JUnit XML file as they complete."""
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = open(path, "w", encoding="utf-8")
+        self._xml = XMLGenerator(self._file, encoding="utf-8", short_empty_elements=True)
+        self._xml.startDocument()
+        self._xml.startElement("testsuites", {"name": "Master Test Validation"})
+    
+    def __enter__(self) -> "JUnitWriter":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def _element(self, name: str, attrs: Dict[str, str], text: Optional[str] = None) -> None:
+        self._xml.startElement(name, attrs)
+        if text:
+            self._xml.characters(XML_INVALID.sub("", text))
+        self._xml.endElement(name)
+    
+    def add(self, name: str, result: Dict[str, Any]) -> None:
+        """Write one suite result and flush it so CI can show partial progress."""
+        skipped = result.get("skipped", False)
+        failed = not result["success"]
+        elapsed = f"{result.get('execution_time', 0):.3f}"
+        message = XML_INVALID.sub("", result["message"])
+        
+        self._xml.startElement("testsuite", {
+            "name": name,
+            "tests": "1",
+            "failures": str(int(failed)),
+            "skipped": str(int(skipped)),
+            "time": elapsed
+        })
+        self._xml.startElement("testcase", {"classname": "master_validation", "name": name, "time": elapsed})
+        
+        if skipped:
+            self._element("skipped", {"message": message})
+        elif failed:
+            self._element("failure", {"message": message})
+        for tag, stream in (("system-out", "stdout"), ("system-err", "stderr")):
+            if result.get(stream):
+                self._element(tag, {}, result[stream])
+        
+        self._xml.endElement("testcase")
+        self._xml.endElement("testsuite")
+        self._file.flush()
+    
+    def close(self) -> None:
+        """Close the root element and the file."""
+        if self._file.closed:
+            return
+        self._xml.endElement("testsuites")
+        self._xml.endDocument()
+        self._file.close()
 
 class MasterTestSuite:
     """Master orchestration for all test suites with comprehensive reporting."""
@@ -27,16 +147,35 @@ class MasterTestSuite:
         self.base_dir = Path(__file__).parent
         self.results = {}
         self.start_time = None
+        self.report_stamp = None
         self.docker_compose_dir = self.base_dir.parent / "local-ai-packaged"
+        # Executables resolved once rather than searching PATH on every call
+        self.docker = shutil.which("docker") or "docker"
+        self.compose = _detect_compose(self.docker)
+        
+        # Keep-alive pool shared by the endpoint probes
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=0))
         
-    def run_all_test_suites(self) -> Dict[str, Any]:
-        """Execute all enhanced test suites and collect results."""
+    def run_all_test_suites(self, changed_only: bool = False) -> Dict[str, Any]:
+        """
+        Execute all enhanced test suites and collect results.
+        
+        Args:
+            changed_only: Skip suites that passed last run and whose inputs
+                are unchanged since
+        """
         print("🧪 Master Test Validation Suite")
-        print("=" * 70)
-        print(f"Starting comprehensive system testing at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(RULE)
+        started = datetime.now()
+        self.report_stamp = started.strftime('%Y%m%d_%H%M%S')
+        print(f"Starting comprehensive system testing at {started.strftime('%Y-%m-%d %H:%M:%S')}")
         
         self.start_time = time.time()
         
+        # Give a freshly started agent a moment, returning as soon as it answers
+        self._wait_ready("http://localhost:8009/health")
+        
         # Test suites to run (in dependency order)
         test_suites = [
             ("System Health", "test_system_health.py", "Infrastructure and core services"),
@@ -44,36 +183,154 @@ class MasterTestSuite:
             ("User Interface", "test_user_interface.py", "Browser experience and workflows")
         ]
         
+        # Additional validation tests; they only need the services up, not
+        # the suite results, so they run alongside the suites
+        validations = [
+            ("Docker Profiles", self._test_docker_profiles, "DOCKER PROFILES VALIDATION"),
+            ("System Readiness", self._test_system_readiness, "SYSTEM READINESS CHECK")
+        ]
+        
         suite_results = {}
+        fingerprints = self._fingerprint_suites(test_suites)
+        manifest = self._load_manifest()
         
-        for suite_name, script_name, description in test_suites:
-            print(f"\n{'='*20} {suite_name.upper()} TESTS {'='*20}")
-            print(f"📋 {description}")
+        def record(name: str, title: str, description: Optional[str], result: Dict[str, Any]) -> None:
+            suite_results[name] = result
+            junit.add(name, result)
             
-            result = self._run_test_suite(script_name)
-            suite_results[suite_name] = result
+            print(SECTION_BANNER.format(title))
+            if description:
+                print(f"📋 {description}")
             
             # Show immediate results
             if result["success"]:
-                print(f"✅ {suite_name}: {result['message']}")
+                print(f"✅ {name}: {result['message']}")
             else:
-                print(f"❌ {suite_name}: {result['message']}")
+                print(f"❌ {name}: {result['message']}")
+        
+        # Each suite is its own subprocess, so run everything else concurrently
+        # once the exclusive suites are done, reporting each task as it finishes
+        with JUnitWriter(self.base_dir / f"test_report_{self.report_stamp}.xml") as junit, \
+                ThreadPoolExecutor(max_workers=min(len(test_suites), MAX_PARALLEL_SUITES)) as suite_executor, \
+                ThreadPoolExecutor(max_workers=len(validations)) as validation_executor:
+            exclusive = []
+            concurrent = []
             
-            time.sleep(2)  # Brief pause between suites
+            # Start the slowest suites first (longest-processing-time order) so
+            # that, with more suites than workers, the run ends on short ones;
+            # suites without a recorded time start first
+            by_last_time = sorted(
+                test_suites,
+                key=lambda suite: manifest.get(suite[0], {}).get("execution_time", float("inf")),
+                reverse=True
+            )
+            
+            for suite_name, script_name, description in by_last_time:
+                title = f"{suite_name.upper()} TESTS"
+                previous = manifest.get(suite_name, {})
+                
+                if changed_only and previous.get("success") and previous.get("fingerprint") == fingerprints[suite_name]:
+                    suite_results[suite_name] = {
+                        "success": True,
+                        "message": "SKIPPED (cached) - inputs unchanged since last passing run",
+                        "skipped": True,
+                        "exit_code": 0,
+                        "execution_time": 0
+                    }
+                    print(SECTION_BANNER.format(title))
+                    print(f"⏭️ {suite_name}: {suite_results[suite_name]['message']}")
+                    junit.add(suite_name, suite_results[suite_name])
+                    continue
+                
+                queue = exclusive if suite_name in EXCLUSIVE_SUITES else concurrent
+                queue.append((suite_name, script_name, title, description))
+            
+            # Exclusive suites run alone before anything else is started
+            for suite_name, script_name, title, description in exclusive:
+                record(suite_name, title, description, self._run_test_suite(script_name))
+            
+            futures = {
+                suite_executor.submit(self._run_test_suite, script_name): (suite_name, title, description)
+                for suite_name, script_name, title, description in concurrent
+            }
+            futures.update({
+                validation_executor.submit(check): (name, title, None)
+                for name, check, title in validations
+            })
+            
+            for future in as_completed(futures):
+                name, title, description = futures[future]
+                record(name, title, description, future.result())
         
-        # Additional validation tests
-        print(f"\n{'='*20} DOCKER PROFILES VALIDATION {'='*20}")
-        profiles_result = self._test_docker_profiles()
-        suite_results["Docker Profiles"] = profiles_result
+        # Report in declaration order, not completion order
+        order = [suite_name for suite_name, _, _ in test_suites] + [name for name, _, _ in validations]
+        suite_results = {name: suite_results[name] for name in order}
         
-        print(f"\n{'='*20} SYSTEM READINESS CHECK {'='*20}")
-        readiness_result = self._test_system_readiness()
-        suite_results["System Readiness"] = readiness_result
+        new_manifest = {}
+        for suite_name, _, _ in test_suites:
+            result = suite_results[suite_name]
+            new_manifest[suite_name] = {
+                "fingerprint": fingerprints[suite_name],
+                "success": result["success"],
+                # Skipped suites keep their last measured time
+                "execution_time": (
+                    manifest[suite_name].get("execution_time", 0) if result.get("skipped")
+                    else result["execution_time"]
+                )
+            }
+        self._save_manifest(new_manifest)
         
         # Generate comprehensive report
         self.results = suite_results
         return self._generate_master_report()
     
+    def _wait_ready(self, url: str, max_wait: float = 2.0) -> bool:
+        """Poll a health URL with exponential backoff until it answers or max_wait passes."""
+        deadline = time.monotonic() + max_wait
+        delay = 0.05
+        
+        while True:
+            try:
+                if self.session.get(url, timeout=0.5).status_code < 500:
+                    return True
+            except requests.RequestException:
+                pass
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(delay, remaining))
+            delay *= 1.5
+    
+    def _fingerprint_suites(self, test_suites: List[Tuple[str, str, str]]) -> Dict[str, str]:
+        """Fingerprint each suite's inputs from file paths, sizes and mtimes."""
+        repo_root = self.base_dir.parent
+        shared = hashlib.blake2b(digest_size=16)
+        for path in sorted({path for pattern in SHARED_INPUTS for path in repo_root.glob(pattern)}):
+            _hash_stat(shared, path, repo_root)
+        
+        fingerprints = {}
+        for suite_name, script_name, _ in test_suites:
+            digest = shared.copy()
+            _hash_stat(digest, self.base_dir / script_name, repo_root)
+            fingerprints[suite_name] = digest.hexdigest()
+        return fingerprints
+    
+    def _load_manifest(self) -> Dict[str, Any]:
+        """Load the previous run's manifest, or nothing if unavailable."""
+        try:
+            return orjson.loads(MANIFEST_FILE.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return {}
+    
+    def _save_manifest(self, manifest: Dict[str, Any]) -> None:
+        """Record this run's suite fingerprints, outcomes and timings."""
+        try:
+            MANIFEST_FILE.parent.mkdir(parents=True, exist_ok=True)
+            MANIFEST_FILE.write_bytes(orjson.dumps(manifest, option=orjson.OPT_INDENT_2))
+        except OSError as e:
+            print(f"\n⚠️ Could not save test manifest: {e}")
+    
     def _run_test_suite(self, script_name: str) -> Dict[str, Any]:
         """Run a specific test suite and capture results."""
         script_path = self.base_dir / script_name
@@ -89,21 +346,41 @@ class MasterTestSuite:
         try:
             start_time = time.time()
             
-            # Run the test script
-            result = subprocess.run([
+            # Run the test script, draining its output as it is produced so
+            # only a bounded tail is ever held in memory
+            process = subprocess.Popen([
                 sys.executable, str(script_path)
-            ], capture_output=True, text=True, timeout=300,  # 5 minute timeout
+            ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
             cwd=str(self.base_dir))
             
+            stdout_tail = deque(maxlen=OUTPUT_TAIL_LINES)
+            stderr_tail = deque(maxlen=OUTPUT_TAIL_LINES)
+            pumps = [
+                threading.Thread(target=_pump, args=(process.stdout, stdout_tail), daemon=True),
+                threading.Thread(target=_pump, args=(process.stderr, stderr_tail), daemon=True)
+            ]
+            for pump in pumps:
+                pump.start()
+            
+            try:
+                returncode = process.wait(timeout=300)  # 5 minute timeout
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+                raise
+            finally:
+                for pump in pumps:
+                    pump.join()
+            
             execution_time = time.time() - start_time
             
             return {
-                "success": result.returncode == 0,
-                "message": f"Completed in {execution_time:.1f}s with exit code {result.returncode}",
-                "exit_code": result.returncode,
+                "success": returncode == 0,
+                "message": f"Completed in {execution_time:.1f}s with exit code {returncode}",
+                "exit_code": returncode,
                 "execution_time": execution_time,
-                "stdout": result.stdout,
-                "stderr": result.stderr
+                "stdout": "".join(stdout_tail),
+                "stderr": "".join(stderr_tail)
             }
             
         except subprocess.TimeoutExpired:
@@ -121,6 +398,19 @@ class MasterTestSuite:
                 "execution_time": 0
             }
     
+    def _profile_services(self, profile: str) -> Dict[str, Any]:
+        """List one profile's services with `config --services`, which Compose v1 supports."""
+        result = subprocess.run([
+            *self.compose, "--profile", profile, "config", "--services"
+        ], capture_output=True, text=True, timeout=30,
+        cwd=str(self.docker_compose_dir))
+        
+        if result.returncode != 0:
+            return {"success": False, "error": result.stderr}
+        
+        services = result.stdout.split()
+        return {"success": True, "services": services, "count": len(services)}
+    
     def _test_docker_profiles(self) -> Dict[str, Any]:
         """Test Docker profiles functionality."""
         try:
@@ -132,34 +422,55 @@ class MasterTestSuite:
                 ("search", "Web search functionality")
             ]
             
-            profile_results = {}
+            # Render one merged config with every tested profile enabled, then
+            # derive each profile's services from it instead of a
+            # compose run per profile
+            profile_args = [arg for profile, _ in profile_tests for arg in ("--profile", profile)]
             
-            for profile, description in profile_tests:
-                # Check which services would start with this profile
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                # Check current running services while the config renders
+                running_future = executor.submit(
+                    subprocess.run,
+                    [*self.compose, "ps", "--services", "--filter", "status=running"],
+                    capture_output=True, text=True, timeout=30,
+                    cwd=str(self.docker_compose_dir)
+                )
+                
                 result = subprocess.run([
-                    "docker-compose", "--profile", profile, "config", "--services"
+                    *self.compose, *profile_args, "config", "--format", "json"
                 ], capture_output=True, text=True, timeout=30,
                 cwd=str(self.docker_compose_dir))
                 
-                if result.returncode == 0:
-                    services = result.stdout.strip().split('\n')
+                current_result = running_future.result()
+            
+            profile_results = {}
+            
+            if result.returncode == 0:
+                all_services = orjson.loads(result.stdout)["services"]
+                
+                for profile, description in profile_tests:
+                    # Services without profiles start under every profile
+                    services = [
+                        name for name, service in all_services.items()
+                        if not service.get("profiles") or profile in service["profiles"]
+                    ]
                     profile_results[profile] = {
                         "success": True,
                         "services": services,
                         "count": len(services)
                     }
-                else:
+            elif len(self.compose) == 1:
+                # Standalone docker-compose may be v1, whose config has no
+                # --format; list each profile's services separately instead
+                for profile, description in profile_tests:
+                    profile_results[profile] = self._profile_services(profile)
+            else:
+                for profile, description in profile_tests:
                     profile_results[profile] = {
                         "success": False,
                         "error": result.stderr
                     }
             
-            # Check current running services
-            current_result = subprocess.run([
-                "docker-compose", "ps", "--services", "--filter", "status=running"
-            ], capture_output=True, text=True, timeout=30,
-            cwd=str(self.docker_compose_dir))
-            
             running_services = []
             if current_result.returncode == 0:
                 running_services = current_result.stdout.strip().split('\n')
@@ -182,12 +493,24 @@ class MasterTestSuite:
     def _test_system_readiness(self) -> Dict[str, Any]:
         """Validate system is ready for use."""
         try:
+            core_services = ["agentic-rag-agent", "open-webui", "supabase-db", "caddy"]
+            endpoints = [
+                ("Agent Health", "http://localhost:8009/health"),
+                ("Agent Models", "http://localhost:8009/v1/models"),
+                ("OpenWebUI", "http://localhost:8002")
+            ]
+            
+            # The docker CLI calls and endpoint probes are independent, so run
+            # them all at once instead of paying each CLI startup in turn
+            with ThreadPoolExecutor(max_workers=len(endpoints) + 2) as executor:
+                containers_future = executor.submit(self._get_running_containers)
+                database_future = executor.submit(self._check_database)
+                endpoint_checks = list(executor.map(self._check_endpoint, endpoints))
+                running_containers = containers_future.result()
+            
             readiness_checks = []
             
             # Check 1: Core services are running
-            core_services = ["agentic-rag-agent", "open-webui", "supabase-db", "caddy"]
-            running_containers = self._get_running_containers()
-            
             missing_core = [svc for svc in core_services if svc not in running_containers]
             readiness_checks.append({
                 "check": "Core Services Running",
@@ -195,57 +518,11 @@ class MasterTestSuite:
                 "details": f"Missing: {missing_core}" if missing_core else "All core services running"
             })
             
-            # Check 2: Key endpoints responding
-            import requests
-            
-            endpoints = [
-                ("Agent Health", "http://localhost:8009/health"),
-                ("Agent Models", "http://localhost:8009/v1/models"),
-                ("OpenWebUI", "http://localhost:8002")
-            ]
-            
-            for name, url in endpoints:
-                try:
-                    response = requests.get(url, timeout=10)
-                    readiness_checks.append({
-                        "check": f"{name} Endpoint",
-                        "success": response.status_code in [200, 302],
-                        "details": f"HTTP {response.status_code}"
-                    })
-                except Exception as e:
-                    readiness_checks.append({
-                        "check": f"{name} Endpoint", 
-                        "success": False,
-                        "details": str(e)
-                    })
+            # Check 2: Key endpoints responding (map keeps the listed order)
+            readiness_checks.extend(endpoint_checks)
             
             # Check 3: Database has data
-            try:
-                db_result = subprocess.run([
-                    "docker", "exec", "supabase-db", "psql", "-U", "postgres",
-                    "-c", "SELECT COUNT(*) FROM documents;", "-t"
-                ], capture_output=True, text=True, timeout=10,
-                cwd=str(self.docker_compose_dir))
-                
-                if db_result.returncode == 0:
-                    doc_count = int(db_result.stdout.strip())
-                    readiness_checks.append({
-                        "check": "Database Documents",
-                        "success": doc_count > 0,
-                        "details": f"{doc_count} documents found"
-                    })
-                else:
-                    readiness_checks.append({
-                        "check": "Database Documents",
-                        "success": False,
-                        "details": "Cannot query database"
-                    })
-            except Exception as e:
-                readiness_checks.append({
-                    "check": "Database Documents",
-                    "success": False,
-                    "details": str(e)
-                })
+            readiness_checks.extend(database_future.result())
             
             passed_checks = sum(1 for check in readiness_checks if check["success"])
             total_checks = len(readiness_checks)
@@ -263,11 +540,58 @@ class MasterTestSuite:
                 "message": f"System readiness check failed: {str(e)}"
             }
     
+    def _check_endpoint(self, endpoint: Tuple[str, str]) -> Dict[str, Any]:
+        """Probe one (name, url) endpoint for the readiness check."""
+        name, url = endpoint
+        try:
+            response = self.session.get(url, timeout=10)
+            return {
+                "check": f"{name} Endpoint",
+                "success": response.status_code in [200, 302],
+                "details": f"HTTP {response.status_code}"
+            }
+        except Exception as e:
+            return {
+                "check": f"{name} Endpoint", 
+                "success": False,
+                "details": str(e)
+            }
+    
+    def _check_database(self) -> List[Dict[str, Any]]:
+        """Check the ingestion tables are populated, in one psql round trip."""
+        tables = ["documents", "chunks"]
+        sql = " UNION ALL ".join(f"SELECT '{table}', COUNT(*) FROM {table}" for table in tables)
+        
+        try:
+            db_result = subprocess.run([
+                self.docker, "exec", "supabase-db", "psql", "-U", "postgres",
+                "-qAtX", "-F", "|", "-c", f"{sql};"
+            ], capture_output=True, text=True, timeout=10,
+            cwd=str(self.docker_compose_dir))
+            
+            if db_result.returncode == 0:
+                # One "table|count" row per table
+                counts = dict(row.split("|") for row in db_result.stdout.split())
+                return [{
+                    "check": f"Database {table.capitalize()}",
+                    "success": int(counts[table]) > 0,
+                    "details": f"{counts[table]} {table} found"
+                } for table in tables]
+            details = "Cannot query database"
+        except Exception as e:
+            details = str(e)
+        
+        return [{
+            "check": f"Database {table.capitalize()}",
+            "success": False,
+            "details": details
+        } for table in tables]
+    
     def _get_running_containers(self) -> List[str]:
         """Get list of currently running container names."""
         try:
             result = subprocess.run([
-                "docker", "ps", "--format", "{{.Names}}"
+                self.docker, "ps", "--format", "{{.Names}}"
             ], capture_output=True, text=True, timeout=10)
             
             if result.returncode == 0:
@@ -286,9 +610,9 @@ class MasterTestSuite:
         passed_suites = sum(1 for result in self.results.values() if result["success"])
         
         # Generate summary
-        print("\n" + "=" * 70)
+        print("\n" + RULE)
         print("📊 MASTER TEST VALIDATION SUMMARY")
-        print("=" * 70)
+        print(RULE)
         
         print(f"🕐 Total Execution Time: {total_time:.1f} seconds")
         print(f"📋 Test Suites Run: {total_suites}")
@@ -365,12 +689,13 @@ class MasterTestSuite:
     def _save_report(self, report: Dict[str, Any]) -> None:
         """Save test report to file."""
         try:
-            report_file = self.base_dir / f"test_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            report_file = self.base_dir / f"test_report_{self.report_stamp}.json"
             
-            with open(report_file, 'w') as f:
-                json.dump(report, f, indent=2, default=str)
+            with open(report_file, 'wb') as f:
+                f.write(orjson.dumps(report, default=str, option=orjson.OPT_INDENT_2))
             
             print(f"\n💾 Detailed report saved to: {report_file}")
+            print(f"💾 JUnit report saved to: {report_file.with_suffix('.xml')}")
             
         except Exception as e:
             print(f"\n⚠️ Could not save report: {e}")
@@ -379,7 +704,9 @@ def main():
     """Run master test validation suite."""
     if len(sys.argv) > 1 and sys.argv[1] == "--help":
         print("Master Test Validation Suite")
-        print("Usage: python test_master_validation.py")
+        print("Usage: python test_master_validation.py [--changed-only]")
+        print("\n--changed-only skips suites that passed last run and whose")
+        print("sources, compose files and test scripts have not changed since")
         print("\nComprehensive system testing including:")
         print("- System health and infrastructure validation")
         print("- API endpoints and streaming functionality")
@@ -400,7 +727,7 @@ def main():
     print("Starting master test validation suite...")
     
     master_tester = MasterTestSuite()
-    report = master_tester.run_all_test_suites()
+    report = master_tester.run_all_test_suites(changed_only="--changed-only" in sys.argv[1:])
     
     # Exit with appropriate code
     if report["overall_status"] == "EXCELLENT":
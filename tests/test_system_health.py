@@ -5,11 +5,15 @@ Comprehensive testing of Docker infrastructure, containers, databases, and core
 Replaces: test_phase1.py with expanded functionality
 """
 
-import subprocess
-import json
-import time
+import asyncio
+import re
 import sys
-from typing import Dict, Any
+from collections import deque
+from contextvars import ContextVar
+from typing import Dict, Any, List, Optional
+
+import httpx
+import orjson
 
 # Import test configuration
 from test_config import TestConfig
@@ -18,203 +22,405 @@ from test_config import TestConfig
 config = TestConfig()
 BASE_URL = config.base_url
 OPENWEBUI_URL = config.openwebui_url
+NEO4J_URL = config.neo4j_url
+
+async def _request(client: httpx.AsyncClient, url: str, method: str = "GET", json: Any = None, timeout: int = 10, need_body: bool = True) -> tuple[int, str]:
+    """Send an HTTP request and return status code and response body, or "" for the body if need_body=False"""
+    try:
+        if not need_body:
+            # Closing the stream unread drops the connection instead of reading the body
+            async with client.stream(method, url, json=json, timeout=timeout) as response:
+                return response.status_code, ""
+        response = await client.request(method, url, json=json, timeout=timeout)
+        return response.status_code, response.text
+    except Exception as e:
+        return 0, str(e)
+
+# Bodies larger than this are not parsed as JSON
+MAX_JSON_BYTES = 10 * 1024 * 1024
+
+async def _request_json(client: httpx.AsyncClient, url: str, method: str = "GET", json: Any = None, timeout: int = 10) -> tuple[int, Any, str]:
+    """Send an HTTP request and return status code, parsed JSON body (None if not JSON or too large) and response text"""
+    try:
+        async with client.stream(method, url, json=json, timeout=timeout) as response:
+            # Refuse oversized bodies before downloading them, and stop part way
+            # through when the length isn't declared up front
+            if int(response.headers.get("content-length", 0)) > MAX_JSON_BYTES:
+                return response.status_code, None, ""
+            
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body += chunk
+                if len(body) > MAX_JSON_BYTES:
+                    return response.status_code, None, ""
+    except Exception as e:
+        return 0, None, str(e)
+    
+    text = body.decode(response.encoding or "utf-8", errors="replace")
+    try:
+        return response.status_code, orjson.loads(body), text
+    except orjson.JSONDecodeError:
+        return response.status_code, None, text
 
-def run_curl(url: str, method: str = "GET", data: str = None, timeout: int = 10) -> tuple[int, str]:
-    """Run curl command and return status code and response"""
-    cmd = ["curl", "-s", "-w", "%{http_code}", url]
+async def _run(*cmd: str, timeout: int = 10, cwd: str = None, text: bool = True) -> tuple[int, Any, Any]:
+    """Run a command without blocking the event loop and return (returncode, stdout, stderr), as bytes if text=False"""
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise
+    if not text:
+        return process.returncode, stdout, stderr
+    return process.returncode, stdout.decode(), stderr.decode()
+
+class PsqlSession:
+    """One long-lived psql process in supabase-db, shared by every query in the run"""
+    
+    SENTINEL = "__END__"
     
-    if method == "POST":
-        cmd.extend(["-X", "POST", "-H", "Content-Type: application/json"])
-        if data:
-            cmd.extend(["-d", data])
+    def __init__(self):
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._lock = asyncio.Lock()
     
-    cmd.extend(["--max-time", str(timeout)])
+    async def query(self, sql: str, timeout: int = 10) -> Optional[str]:
+        """Run SQL and return its unaligned output, or None if psql has gone away"""
+        async with self._lock:
+            if self._process is None:
+                self._process = await asyncio.create_subprocess_exec(
+                    "docker", "exec", "-i", "supabase-db", "psql", "-U", "postgres", "-qAtX", "-F,",
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL
+                )
+            
+            # The echoed sentinel marks where this query's output ends
+            try:
+                self._process.stdin.write(f"{sql}\n\\echo {self.SENTINEL}\n".encode())
+                await self._process.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError):
+                return None
+            
+            lines = []
+            try:
+                while True:
+                    line = await asyncio.wait_for(self._process.stdout.readline(), timeout)
+                    if not line:
+                        return None
+                    line = line.decode().rstrip("\n")
+                    if line == self.SENTINEL:
+                        return "\n".join(lines)
+                    lines.append(line)
+            except asyncio.TimeoutError:
+                # Output is out of step with our queries now, so start over next time
+                self._process.kill()
+                await self._process.wait()
+                self._process = None
+                raise
+    
+    async def close(self) -> None:
+        """End the psql process."""
+        if self._process is None:
+            return
+        
+        process, self._process = self._process, None
+        process.stdin.close()
+        try:
+            await asyncio.wait_for(process.wait(), 5)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+
+PSQL = PsqlSession()
+
+async def psql_counts(*tables: str) -> Optional[Dict[str, int]]:
+    """Count rows in several tables with one query, or None if the query fails"""
+    sql = "SELECT " + ", ".join(f"(SELECT COUNT(*) FROM {table})" for table in tables) + ";"
+    output = await PSQL.query(sql)
+    if not output:
+        return None
     
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout + 5)
-        # Status code is at the end of the output
-        output = result.stdout
-        if len(output) >= 3:
-            status_code = int(output[-3:])
-            response_body = output[:-3]
-            return status_code, response_body
-        else:
-            return 0, output
+        counts = [int(value) for value in output.split(",")]
+    except ValueError:
+        return None
+    return dict(zip(tables, counts)) if len(counts) == len(tables) else None
+
+# Log lines showing the agent started; at least two must appear
+STARTUP_INDICATORS = [
+    "Starting FastAPI agent",
+    "Application startup complete", 
+    "Agent Starting",
+    "STREAMING_ENABLED",
+    "MEMORY_ENABLED"
+]
+STARTUP_PATTERN = re.compile("|".join(map(re.escape, STARTUP_INDICATORS)))
+
+# Variables the agent container must define, matched at line starts of `env` output
+REQUIRED_ENV_VARS = [
+    "DATABASE_URL",
+    "LLM_API_KEY",
+    "LLM_CHOICE",
+    "STREAMING_ENABLED",
+    "MEMORY_ENABLED"
+]
+ENV_PATTERN = re.compile(rb"^(" + b"|".join(re.escape(var.encode()) for var in REQUIRED_ENV_VARS) + rb")=", re.M)
+
+# Listing of the expected containers, fetched by one `docker ps` per run and
+# shared by every test
+_containers: Optional[asyncio.Task] = None
+
+async def _list_containers() -> tuple[int, Dict[str, str], str]:
+    # Let the daemon drop unrelated containers; filters are regexes, so anchor
+    # them to keep e.g. open-webui from matching open-webui-backend
+    cmd = ["docker", "ps", "--format", "{{.Names}}\t{{.Status}}"]
+    for name in config.get_expected_containers():
+        cmd += ["--filter", f"name=^{name}$"]
+    returncode, stdout, stderr = await _run(*cmd, timeout=10)
+    
+    containers = {}
+    for line in stdout.strip().split('\n'):
+        if '\t' in line:
+            name, status = line.split('\t', 1)
+            containers[name] = status
+    return returncode, containers, stderr
+
+async def running_containers() -> tuple[int, Dict[str, str], str]:
+    """Return (returncode, {name: status}, stderr) for running expected containers, cached for the run"""
+    global _containers
+    if _containers is None:
+        _containers = asyncio.ensure_future(_list_containers())
+    return await _containers
+
+# Output lines of the test running in the current task
+_output: ContextVar[Optional[List[str]]] = ContextVar("output", default=None)
+
+def log(message: str) -> None:
+    """Record a line of test output, printed with its test once all tests finish"""
+    lines = _output.get()
+    if lines is None:
+        print(message)
+    else:
+        lines.append(message)
+
+# One chat completion, preceded by a message count, shared by the chat and
+# stateless-mode tests so the model is only called once per run
+_chat_probe: Optional[asyncio.Task] = None
+
+async def _message_count() -> Optional[int]:
+    try:
+        counts = await psql_counts("messages")
     except Exception as e:
-        return 0, str(e)
+        log(f"⚠️  Message count failed: {e}")
+        return None
+    return counts["messages"] if counts else None
+
+# The agent stores conversation turns in the background after responding, so
+# a write can land after the response; keep watching the count this long
+WRITE_SETTLE_SECONDS = 3.0
 
-def test_models_endpoint() -> bool:
+async def _settled_message_count(initial_count: int) -> Optional[int]:
+    """Poll the message count until it moves away from initial_count or the settle window ends"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + WRITE_SETTLE_SECONDS
+    
+    while True:
+        count = await _message_count()
+        if count is None or count != initial_count or loop.time() >= deadline:
+            return count
+        await asyncio.sleep(0.25)
+
+async def _run_chat_probe(client: httpx.AsyncClient) -> Dict[str, Any]:
+    messages_before = await _message_count()
+    
+    test_payload = config.create_chat_payload("ping", stream=False)
+    status_code, data, response = await _request_json(client, f"{BASE_URL}/v1/chat/completions", "POST", test_payload, 30)
+    
+    return {
+        "status": status_code,
+        "data": data,
+        "body": response,
+        "messages_before": messages_before
+    }
+
+async def chat_probe(client: httpx.AsyncClient) -> Dict[str, Any]:
+    """Return the run's chat completion status, body and the message count taken before it"""
+    global _chat_probe
+    if _chat_probe is None:
+        _chat_probe = asyncio.ensure_future(_run_chat_probe(client))
+    return await _chat_probe
+
+async def test_models_endpoint(client: httpx.AsyncClient) -> bool:
     """Test GET /v1/models endpoint."""
-    status_code, response = run_curl(f"{BASE_URL}/v1/models")
+    status_code, data, _ = await _request_json(client, f"{BASE_URL}/v1/models")
     
     if status_code != 200:
-        print(f"❌ Models endpoint failed: HTTP {status_code}")
+        log(f"❌ Models endpoint failed: HTTP {status_code}")
         return False
     
     primary_model = config.primary_model
-    if primary_model not in response:
-        print(f"❌ {primary_model} not found in models response")
+    models = data.get("data") if isinstance(data, dict) else None
+    if not isinstance(models, list) or not any(
+        isinstance(model, dict) and model.get("id") == primary_model for model in models
+    ):
+        log(f"❌ {primary_model} not found in models response")
         return False
     
-    print("✅ Models endpoint working")
+    log("✅ Models endpoint working")
     return True
 
-def test_chat_completions() -> bool:
+async def test_chat_completions(client: httpx.AsyncClient) -> bool:
     """Test POST /v1/chat/completions endpoint."""
-    test_payload = config.create_chat_payload("ping", stream=False)
-    payload = json.dumps(test_payload)
-    
-    status_code, response = run_curl(f"{BASE_URL}/v1/chat/completions", "POST", payload, 30)
+    probe = await chat_probe(client)
     
-    if status_code != 200:
-        print(f"❌ Chat completions failed: HTTP {status_code}")
-        print(f"Response: {response[:200]}...")
+    if probe["status"] != 200:
+        log(f"❌ Chat completions failed: HTTP {probe['status']}")
+        log(f"Response: {probe['body'][:200]}...")
         return False
     
-    if "choices" not in response:
-        print(f"❌ No choices in chat response")
+    try:
+        content = probe["data"]["choices"][0]["message"]["content"]
+    except (TypeError, KeyError, IndexError):
+        content = None
+    if not content:
+        log(f"❌ No choices in chat response")
         return False
     
-    print("✅ Chat completions working")
+    log("✅ Chat completions working")
     return True
 
-def test_openwebui_access() -> bool:
+async def test_openwebui_access(client: httpx.AsyncClient) -> bool:
     """Test OpenWebUI accessibility."""
-    status_code, response = run_curl(OPENWEBUI_URL)
+    status_code, _ = await _request(client, OPENWEBUI_URL, need_body=False)
     
     if status_code == 200:
-        print("✅ OpenWebUI accessible")
+        log("✅ OpenWebUI accessible")
         return True
     else:
-        print(f"❌ OpenWebUI not accessible: HTTP {status_code}")
+        log(f"❌ OpenWebUI not accessible: HTTP {status_code}")
         return False
 
-def test_health_endpoint() -> bool:
+async def test_health_endpoint(client: httpx.AsyncClient) -> bool:
     """Test /health endpoint."""
-    status_code, response = run_curl(f"{BASE_URL}/health")
+    status_code, data, _ = await _request_json(client, f"{BASE_URL}/health")
     
-    if status_code == 200 and ("healthy" in response or "ok" in response):
-        print("✅ Health endpoint working")
+    if status_code == 200 and isinstance(data, dict) and data.get("status") in ("healthy", "ok"):
+        log("✅ Health endpoint working")
         return True
     
-    print(f"❌ Health check failed: HTTP {status_code}")
+    log(f"❌ Health check failed: HTTP {status_code}")
     return False
 
-def test_database_writes() -> bool:
+async def test_database_writes(client: httpx.AsyncClient) -> bool:
     """Test that no database writes occur in stateless mode."""
     try:
-        # Get initial message count
-        result = subprocess.run([
-            "docker", "exec", "supabase-db", "psql", "-U", "postgres", 
-            "-c", "SELECT COUNT(*) FROM messages;", "-t"
-        ], capture_output=True, text=True, timeout=10)
-        
-        if result.returncode != 0:
-            print("❌ Cannot query database")
-            return False
+        # Message count taken before the shared chat request
+        probe = await chat_probe(client)
+        initial_count = probe["messages_before"]
         
-        initial_count = int(result.stdout.strip())
-        
-        # Make a chat request
-        test_payload = config.create_chat_payload("test stateless", stream=False)
-        payload = json.dumps(test_payload)
-        status_code, response = run_curl(f"{BASE_URL}/v1/chat/completions", "POST", payload, 30)
+        if initial_count is None:
+            log("❌ Cannot query database")
+            return False
         
-        if status_code != 200:
-            print("❌ Chat request failed for database test")
+        if probe["status"] != 200:
+            log("❌ Chat request failed for database test")
             return False
         
-        # Check message count again
-        result = subprocess.run([
-            "docker", "exec", "supabase-db", "psql", "-U", "postgres", 
-            "-c", "SELECT COUNT(*) FROM messages;", "-t"
-        ], capture_output=True, text=True, timeout=10)
+        # Writes happen after the response, so wait for any to land
+        final_count = await _settled_message_count(initial_count)
         
-        final_count = int(result.stdout.strip())
+        if final_count is None:
+            log("❌ Cannot query database")
+            return False
         
         if final_count == initial_count:
-            print("✅ No database writes confirmed (stateless mode working)")
+            log("✅ No database writes confirmed (stateless mode working)")
             return True
         else:
-            print(f"❌ Database writes detected: {initial_count} → {final_count}")
+            log(f"❌ Database writes detected: {initial_count} → {final_count}")
             return False
             
     except Exception as e:
-        print(f"❌ Database test error: {e}")
+        log(f"❌ Database test error: {e}")
         return False
 
-def test_agent_startup_logs() -> bool:
+async def test_agent_startup_logs(client: httpx.AsyncClient) -> bool:
     """Test that agent startup logs show system is operational."""
     try:
         # First, check if container exists and is running
-        check_result = subprocess.run([
-            "docker", "ps", "-q", "-f", "name=agentic-rag-agent"
-        ], capture_output=True, text=True, timeout=5, 
-        cwd="/Users/jack/Developer/local-RAG/local-ai-packaged")
+        _, containers, _ = await running_containers()
         
-        if not check_result.stdout.strip():
-            print("❌ Container 'agentic-rag-agent' not found or not running")
+        if "agentic-rag-agent" not in containers:
+            log("❌ Container 'agentic-rag-agent' not found or not running")
             return False
         
-        # Get all container logs to find startup messages from beginning
-        result = subprocess.run([
-            "docker", "logs", "agentic-rag-agent"
-        ], capture_output=True, text=True, timeout=20,
-        cwd="/Users/jack/Developer/local-RAG/local-ai-packaged")
+        # Stream the logs from the beginning, where startup messages are, and
+        # stop as soon as enough indicators have been seen
+        process = await asyncio.create_subprocess_exec(
+            "docker", "logs", "agentic-rag-agent",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            limit=2 ** 20
+        )
+        matched = set()
+        last_lines = deque(maxlen=10)
+        
+        async def scan() -> None:
+            async for line in process.stdout:
+                text = line.decode(errors="replace").rstrip()
+                last_lines.append(text)
+                matched.update(STARTUP_PATTERN.findall(text))
+                if len(matched) >= 2:  # Require at least 2 of 5 indicators
+                    return
+        
+        try:
+            await asyncio.wait_for(scan(), 20)
+        finally:
+            # Stopped early or timed out: the rest of the log is not needed
+            if not process.stdout.at_eof():
+                try:
+                    process.kill()
+                except ProcessLookupError:
+                    pass
+            await process.wait()
+        
+        if len(matched) >= 2:
+            log("✅ Agent startup logs confirmed")
+            return True
         
-        if result.returncode != 0:
-            print(f"❌ Failed to get container logs: {result.stderr}")
+        if process.returncode != 0:
+            log(f"❌ Failed to get container logs: {' '.join(last_lines)}")
             return False
         
-        logs = result.stdout + result.stderr
-        
-        # Check for key startup indicators
-        startup_indicators = [
-            "Starting FastAPI agent",
-            "Application startup complete", 
-            "Agent Starting",
-            "STREAMING_ENABLED",
-            "MEMORY_ENABLED"
-        ]
-        
-        found_indicators = [indicator for indicator in startup_indicators if indicator in logs]
-        
-        if len(found_indicators) >= 2:  # Require at least 2 of 5 indicators
-            print("✅ Agent startup logs confirmed")
-            return True
-        else:
-            print(f"❌ Agent startup logs not found. Found indicators: {found_indicators}")
-            # Debug: show last few log lines for troubleshooting
-            log_lines = logs.split('\n')[-10:]
-            print("Last 10 log lines:")
-            for line in log_lines:
-                if line.strip():
-                    print(f"  {line}")
-            return False
+        found_indicators = [indicator for indicator in STARTUP_INDICATORS if indicator in matched]
+        log(f"❌ Agent startup logs not found. Found indicators: {found_indicators}")
+        # Debug: show last few log lines for troubleshooting
+        log("Last 10 log lines:")
+        for line in last_lines:
+            if line.strip():
+                log(f"  {line}")
+        return False
             
     except Exception as e:
-        print(f"❌ Log check error: {e}")
+        log(f"❌ Log check error: {e}")
         return False
 
-def test_all_expected_containers_running() -> bool:
+async def test_all_expected_containers_running(client: httpx.AsyncClient) -> bool:
     """Test that all expected containers are running and healthy."""
     try:
         # Get container status
-        result = subprocess.run([
-            "docker", "ps", "--format", "{{.Names}}\t{{.Status}}"
-        ], capture_output=True, text=True, timeout=10,
-        cwd="/Users/jack/Developer/local-RAG/local-ai-packaged")
+        returncode, containers, stderr = await running_containers()
         
-        if result.returncode != 0:
-            print(f"❌ Failed to get container status: {result.stderr}")
+        if returncode != 0:
+            log(f"❌ Failed to get container status: {stderr}")
             return False
         
-        containers = {}
-        for line in result.stdout.strip().split('\n'):
-            if '\t' in line:
-                name, status = line.split('\t', 1)
-                containers[name] = status
-        
         # Expected core containers (from configuration)
         expected_containers = config.get_expected_containers()
         
@@ -228,155 +434,185 @@ def test_all_expected_containers_running() -> bool:
                 unhealthy_containers.append(f"{container}: {containers[container]}")
         
         if missing_containers:
-            print(f"❌ Missing containers: {missing_containers}")
+            log(f"❌ Missing containers: {missing_containers}")
             return False
         
         if unhealthy_containers:
-            print(f"❌ Unhealthy containers: {unhealthy_containers}")
+            log(f"❌ Unhealthy containers: {unhealthy_containers}")
             return False
         
-        print(f"✅ All {len(expected_containers)} core containers running")
+        log(f"✅ All {len(expected_containers)} core containers running")
         return True
         
     except Exception as e:
-        print(f"❌ Container check error: {e}")
+        log(f"❌ Container check error: {e}")
         return False
 
-def test_data_ingestion_pipeline() -> bool:
+async def test_data_ingestion_pipeline(client: httpx.AsyncClient) -> bool:
     """Test that RAG data pipeline has ingested documents and chunks."""
     try:
-        # Check documents table
-        doc_result = subprocess.run([
-            "docker", "exec", "supabase-db", "psql", "-U", "postgres", 
-            "-c", "SELECT COUNT(*) FROM documents;", "-t"
-        ], capture_output=True, text=True, timeout=10,
-        cwd="/Users/jack/Developer/local-RAG/local-ai-packaged")
-        
-        if doc_result.returncode != 0:
-            print("❌ Cannot query documents table")
-            return False
-        
-        doc_count = int(doc_result.stdout.strip())
+        # Count documents and chunks in one query
+        counts = await psql_counts("documents", "chunks")
         
-        # Check chunks table
-        chunk_result = subprocess.run([
-            "docker", "exec", "supabase-db", "psql", "-U", "postgres", 
-            "-c", "SELECT COUNT(*) FROM chunks;", "-t"
-        ], capture_output=True, text=True, timeout=10,
-        cwd="/Users/jack/Developer/local-RAG/local-ai-packaged")
-        
-        if chunk_result.returncode != 0:
-            print("❌ Cannot query chunks table")
+        if counts is None:
+            log("❌ Cannot query documents and chunks tables")
             return False
         
-        chunk_count = int(chunk_result.stdout.strip())
+        doc_count = counts["documents"]
+        chunk_count = counts["chunks"]
         
         if doc_count == 0:
-            print("❌ No documents found in database")
+            log("❌ No documents found in database")
             return False
         
         if chunk_count == 0:
-            print("❌ No chunks found in database")
+            log("❌ No chunks found in database")
             return False
         
-        print(f"✅ Data pipeline healthy: {doc_count} documents, {chunk_count} chunks")
+        log(f"✅ Data pipeline healthy: {doc_count} documents, {chunk_count} chunks")
         return True
         
     except Exception as e:
-        print(f"❌ Data pipeline check error: {e}")
+        log(f"❌ Data pipeline check error: {e}")
         return False
 
-def test_knowledge_graph_population() -> bool:
+async def test_knowledge_graph_population(client: httpx.AsyncClient) -> bool:
     """Test that Neo4j knowledge graph has nodes and relationships."""
     try:
-        # Simple test - check if Neo4j is responding
-        # More comprehensive testing would require Neo4j client libraries
-        result = subprocess.run([
-            "docker", "exec", "local-ai-packaged-neo4j-1", "cypher-shell", "-u", "neo4j", "-p", "password", 
-            "MATCH (n) RETURN count(n) as nodeCount;"
-        ], capture_output=True, text=True, timeout=15,
-        cwd="/Users/jack/Developer/local-RAG/local-ai-packaged")
-        
-        if result.returncode != 0:
-            print("❌ Cannot query Neo4j - authentication or connection issue")
-            print(f"Neo4j error: {result.stderr[:100]}")
+        # Ask Neo4j's HTTP endpoint directly; docker exec is only the fallback
+        # for when the port isn't published to the host
+        try:
+            response = await client.post(
+                f"{NEO4J_URL}/db/neo4j/tx/commit",
+                json={"statements": [{"statement": "MATCH (n) RETURN count(n) AS nodeCount"}]},
+                auth=config.neo4j_auth,
+                timeout=15
+            )
+        except httpx.TransportError:
+            response = None
+        
+        if response is not None:
+            body = response.json() if response.status_code == 200 else {}
+            if response.status_code != 200 or body.get("errors"):
+                log(f"❌ Cannot query Neo4j - HTTP {response.status_code} {body.get('errors', '')}")
+                # Don't fail the test for Neo4j issues as it's not critical
+                log("⚠️  Neo4j check skipped - not critical for core functionality")
+                return True
+            
+            node_count = body["results"][0]["data"][0]["row"][0]
+            log(f"✅ Neo4j knowledge graph accessible: {node_count} nodes")
+            return True
+        
+        user, password = config.neo4j_auth
+        returncode, stdout, stderr = await _run(
+            "docker", "exec", "local-ai-packaged-neo4j-1", "cypher-shell", "-u", user, "-p", password,
+            "MATCH (n) RETURN count(n) as nodeCount;",
+            timeout=15
+        )
+        
+        if returncode != 0:
+            log("❌ Cannot query Neo4j - authentication or connection issue")
+            log(f"Neo4j error: {stderr[:100]}")
             # Don't fail the test for Neo4j issues as it's not critical
-            print("⚠️  Neo4j check skipped - not critical for core functionality")
+            log("⚠️  Neo4j check skipped - not critical for core functionality")
             return True
         
         # Parse result for node count
-        if "nodeCount" in result.stdout:
-            print("✅ Neo4j knowledge graph accessible")
+        if "nodeCount" in stdout:
+            log("✅ Neo4j knowledge graph accessible")
             return True
         else:
-            print("⚠️  Neo4j response format unexpected - assumed working")
+            log("⚠️  Neo4j response format unexpected - assumed working")
             return True
         
     except Exception as e:
-        print(f"⚠️  Neo4j check error: {e} - assumed working")
+        log(f"⚠️  Neo4j check error: {e} - assumed working")
         return True
 
-def test_environment_variables() -> bool:
+async def test_environment_variables(client: httpx.AsyncClient) -> bool:
     """Test that critical environment variables are set correctly."""
     try:
         # Check agent container environment
-        result = subprocess.run([
-            "docker", "exec", "agentic-rag-agent", "env"
-        ], capture_output=True, text=True, timeout=10,
-        cwd="/Users/jack/Developer/local-RAG/local-ai-packaged")
-        
-        if result.returncode != 0:
-            print("❌ Cannot check agent environment variables")
+        # Only a few names are looked up, so search the raw bytes rather than
+        # decoding the whole environment
+        returncode, env_bytes, _ = await _run(
+            "docker", "exec", "agentic-rag-agent", "env",
+            timeout=10,
+            text=False
+        )
+        
+        if returncode != 0:
+            log("❌ Cannot check agent environment variables")
             return False
         
-        env_vars = result.stdout
-        
-        # Check for critical variables
-        required_vars = [
-            "DATABASE_URL",
-            "LLM_API_KEY", 
-            "LLM_CHOICE",
-            "STREAMING_ENABLED",
-            "MEMORY_ENABLED"
-        ]
-        
-        missing_vars = []
-        for var in required_vars:
-            if f"{var}=" not in env_vars:
-                missing_vars.append(var)
+        # Check for critical variables in one pass over the output
+        found = {name.decode() for name in ENV_PATTERN.findall(env_bytes)}
+        missing_vars = [var for var in REQUIRED_ENV_VARS if var not in found]
         
         if missing_vars:
-            print(f"❌ Missing environment variables: {missing_vars}")
+            log(f"❌ Missing environment variables: {missing_vars}")
             return False
         
-        print("✅ All critical environment variables present")
+        log("✅ All critical environment variables present")
         return True
         
     except Exception as e:
-        print(f"❌ Environment check error: {e}")
+        log(f"❌ Environment check error: {e}")
         return False
 
-def test_service_networking() -> bool:
+async def test_service_networking(client: httpx.AsyncClient) -> bool:
     """Test that services can communicate with each other."""
     try:
         # Simple test - if the agent API is responding and we have data, networking works
         # This is more reliable than trying to use nc or complex database queries
-        api_test = subprocess.run([
-            "curl", "-s", "-f", "http://localhost:8009/health"
-        ], capture_output=True, text=True, timeout=5)
+        status_code, _ = await _request(client, f"{BASE_URL}/health", timeout=5, need_body=False)
         
-        if api_test.returncode == 0:
+        if 200 <= status_code < 400:
             # If API works and we know data pipeline has documents, networking is functional
-            print("✅ Service networking functional")
+            log("✅ Service networking functional")
             return True
         else:
-            print("❌ Service networking issues detected")
+            log("❌ Service networking issues detected")
             return False
         
     except Exception as e:
-        print(f"❌ Network test error: {e}")
+        log(f"❌ Network test error: {e}")
         return False
 
+# Tests that are skipped when any test they require fails, instead of
+# waiting out docker exec or request timeouts against a service that is down
+DEPENDENCIES = {
+    "Chat Completions": {"Health Endpoint"},
+    "Database Writes (Stateless)": {"All Expected Containers Running"},
+    "Data Ingestion Pipeline": {"All Expected Containers Running"},
+    "Environment Variables": {"All Expected Containers Running"}
+}
+
+async def run_tests(all_tests) -> tuple[list[Optional[bool]], Dict[str, List[str]]]:
+    """Run all tests concurrently over one pooled HTTP client.
+    
+    Returns each test's result (None when skipped) and its buffered output lines.
+    """
+    limits = httpx.Limits(max_keepalive_connections=10)
+    tasks: Dict[str, asyncio.Task] = {}
+    outputs: Dict[str, List[str]] = {test_name: [] for test_name, _ in all_tests}
+    
+    async def run(test_name, test_func, client) -> Optional[bool]:
+        # Each task runs in its own context, so this only captures this test
+        _output.set(outputs[test_name])
+        prerequisites = [tasks[name] for name in DEPENDENCIES.get(test_name, ())]
+        if prerequisites and not all(await asyncio.gather(*prerequisites)):
+            return None
+        return await test_func(client)
+    
+    try:
+        async with httpx.AsyncClient(timeout=30, limits=limits) as client:
+            for test_name, test_func in all_tests:
+                tasks[test_name] = asyncio.ensure_future(run(test_name, test_func, client))
+            return await asyncio.gather(*tasks.values()), outputs
+    finally:
+        await PSQL.close()
+
 def main():
     """Run comprehensive system health tests."""
     print("🧪 Running System Health Test Suite")
@@ -405,13 +641,27 @@ def main():
     passed = 0
     total = len(all_tests)
     
-    print(f"\n📋 Running {total} comprehensive system health tests...")
+    print(f"\n📋 Running {total} comprehensive system health tests concurrently...\n")
+    
+    results, outputs = asyncio.run(run_tests(all_tests))
+    
+    # Emit each test's output as one block, in test order
+    report = []
+    for test_name, _ in all_tests:
+        if outputs[test_name]:
+            report.append(f"🔍 {test_name}")
+            report.extend(f"   {line}" for line in outputs[test_name])
+    sys.stdout.write("\n".join(report) + "\n")
     
-    for test_name, test_func in all_tests:
-        print(f"\n🔍 Testing {test_name}...")
-        if test_func():
+    print()
+    for (test_name, _), result in zip(all_tests, results):
+        if result is None:
+            failed = ", ".join(sorted(DEPENDENCIES[test_name]))
+            print(f"⏭️  {test_name} (skipped: {failed} failed)")
+            continue
+        print(f"{'✅' if result else '❌'} {test_name}")
+        if result:
             passed += 1
-        time.sleep(1)
     
     print("\n" + "=" * 60)
     print(f"📊 Results: {passed}/{total} tests passed ({passed/total*100:.1f}% success rate)")